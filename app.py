@@ -12,6 +12,7 @@ import base64
 import urllib.request
 import urllib.parse
 from io import BytesIO
+from html import escape as html_escape
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
@@ -5143,10 +5144,106 @@ def handle_get_assessment_result(query_params: Dict[str, Any]) -> Dict[str, Any]
         }
 
 # GDPR Compliance Handler Functions
+_HTML_HEADERS = {'Content-Type': 'text/html'}
+_ERR_PREFIX = '<h1>Error</h1><p>'
+_ERR_SUFFIX = '</p>'
+_MY_DATA_REDIRECT_HEADERS = {'Location': '/gdpr/my-data'}
+
+def _error_response(status_code: int, message: str) -> Dict[str, Any]:
+    """Build an HTML error response; callers must escape untrusted messages"""
+    return {
+        'statusCode': status_code,
+        'headers': _HTML_HEADERS,
+        'body': _ERR_PREFIX + message + _ERR_SUFFIX
+    }
+
+# Minimal stylesheet for the GDPR pages, covering only the Bootstrap classes
+# they use, so the pages render without blocking on CDN stylesheets
+_GDPR_CRITICAL_CSS = """
+*,::before,::after{box-sizing:border-box}
+body{margin:0;font-family:system-ui,-apple-system,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif;line-height:1.5;color:#212529;background:#fff}
+h1,h2,h4,.h3,.h5{margin-top:0;margin-bottom:.5rem;font-weight:500;line-height:1.2}
+h1{font-size:2.5rem}.h3{font-size:1.75rem}h4{font-size:1.5rem}.h5{font-size:1.25rem}
+p,ul{margin-top:0;margin-bottom:1rem}
+a{color:#0d6efd}
+.container{width:100%;max-width:1140px;margin:0 auto;padding:0 .75rem}
+.row{display:flex;flex-wrap:wrap;margin:0 -.75rem}
+.row>*{width:100%;max-width:100%;padding:0 .75rem}
+@media (min-width:768px){.col-md-4{flex:0 0 auto;width:33.333%}}
+@media (min-width:992px){.col-lg-8{flex:0 0 auto;width:66.667%}.col-lg-10{flex:0 0 auto;width:83.333%}}
+.navbar{padding:.5rem 0}
+.navbar>.container{display:flex;flex-wrap:wrap;align-items:center;justify-content:space-between}
+.navbar-brand{margin-right:1rem;font-size:1.25rem;text-decoration:none}
+.navbar-nav{display:flex}
+.nav-link{padding:.5rem;color:rgba(0,0,0,.55);text-decoration:none}
+.card{display:flex;flex-direction:column;background:#fff;border:1px solid rgba(0,0,0,.175);border-radius:.375rem}
+.card-header{padding:.5rem 1rem;border-bottom:1px solid rgba(0,0,0,.175);border-radius:.375rem .375rem 0 0}
+.card-body{flex:1 1 auto;padding:1rem}
+.card-footer{padding:.5rem 1rem;border-top:1px solid rgba(0,0,0,.175)}
+.alert{padding:1rem;margin-bottom:1rem;border:1px solid transparent;border-radius:.375rem}
+.alert-info{color:#055160;background:#cff4fc;border-color:#b6effb}
+.alert-success{color:#0a3622;background:#d1e7dd;border-color:#a3cfbb}
+.alert-warning{color:#664d03;background:#fff3cd;border-color:#ffe69c}
+.btn{display:inline-block;padding:.375rem .75rem;font-size:1rem;line-height:1.5;text-align:center;text-decoration:none;background:none;border:1px solid transparent;border-radius:.375rem;cursor:pointer}
+.btn-sm{padding:.25rem .5rem;font-size:.875rem}
+.btn-primary{color:#fff;background:#0d6efd;border-color:#0d6efd}
+.btn-danger{color:#fff;background:#dc3545;border-color:#dc3545}
+.btn-outline-primary{color:#0d6efd;border-color:#0d6efd}
+.btn-outline-danger{color:#dc3545;border-color:#dc3545}
+.btn-outline-secondary{color:#6c757d;border-color:#6c757d}
+.form-label{display:inline-block;margin-bottom:.5rem}
+.form-check{display:block;min-height:1.5rem;padding-left:1.5em;margin-bottom:.125rem}
+.form-check-input{float:left;width:1em;height:1em;margin:.25em 0 0 -1.5em}
+.form-switch{padding-left:2.5em}
+.form-switch .form-check-input{width:2em;margin-left:-2.5em}
+.lead{font-size:1.25rem;font-weight:300}
+.small{font-size:.875em}
+.icon-lg{font-size:2em;line-height:1}
+.shadow{box-shadow:0 .5rem 1rem rgba(0,0,0,.15)}.shadow-sm{box-shadow:0 .125rem .25rem rgba(0,0,0,.075)}
+.bg-light{background-color:#f8f9fa}.bg-primary{background-color:#0d6efd}.bg-success{background-color:#198754}.bg-danger{background-color:#dc3545}.bg-warning{background-color:#ffc107}
+.border-danger{border-color:#dc3545}.border-success{border-color:#198754}.border-warning{border-color:#ffc107}
+.text-white{color:#fff}.text-dark{color:#212529}.text-muted{color:#6c757d}.text-primary{color:#0d6efd}
+.fw-bold{font-weight:700}
+.d-flex{display:flex}.justify-content-between{justify-content:space-between}.align-items-center{align-items:center}
+.h-100{height:100%}.w-100{width:100%}
+.mx-auto{margin-right:auto;margin-left:auto}.ms-auto{margin-left:auto}.ms-2{margin-left:.5rem}.me-2{margin-right:.5rem}.me-3{margin-right:1rem}
+.mt-2{margin-top:.5rem}.mt-4{margin-top:1.5rem}.mb-0{margin-bottom:0}.mb-3{margin-bottom:1rem}.mb-4{margin-bottom:1.5rem}
+.py-5{padding-top:3rem;padding-bottom:3rem}
+"""
+_GDPR_STYLE_TAG = '<style>' + _GDPR_CRITICAL_CSS + '</style>'
+
+def get_gdpr_user_email(headers: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Resolve the requesting user from the web_session_id session cookie"""
+    headers = headers or {}
+    
+    # Extract session ID from cookies (case insensitive)
+    cookie_header = headers.get('cookie', headers.get('Cookie', '')) or ''
+    session_data = None
+    if 'web_session_id=' in cookie_header:
+        for cookie in cookie_header.split(';'):
+            if 'web_session_id=' in cookie:
+                session_data = aws_mock.get_session(cookie.split('=')[1].strip())
+                break
+    
+    return (session_data or {}).get('user_email')
+
+def _login_redirect() -> Dict[str, Any]:
+    """Redirect to login when the request has no valid session"""
+    return {
+        'statusCode': 302,
+        'headers': {
+            'Location': '/login',
+            'Content-Type': 'text/html'
+        },
+        'body': ''
+    }
+
 def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR My Data dashboard page"""
     try:
-        user_email = 'test@ieltsgenaiprep.com'
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
         consent_data = aws_mock.get_user_consent(user_email)
         
         html_content = f"""
@@ -5156,8 +5253,7 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>My Data - IELTS GenAI Prep</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.2.1/css/all.min.css" rel="stylesheet">
+    {_GDPR_STYLE_TAG}
 </head>
 <body>
     <nav class="navbar navbar-expand-lg navbar-light bg-light">
@@ -5178,7 +5274,7 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
                 <div class="alert alert-info">
                     <div class="d-flex">
                         <div class="me-3">
-                            <i class="fas fa-info-circle fa-2x"></i>
+                            <span class="icon-lg" aria-hidden="true">&#8505;</span>
                         </div>
                         <div>
                             <h4>Your Privacy Matters</h4>
@@ -5191,7 +5287,7 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
                     <div class="col-md-4 mb-4">
                         <div class="card h-100 shadow-sm">
                             <div class="card-header bg-primary text-white">
-                                <h2 class="h5 mb-0"><i class="fas fa-cogs me-2"></i> Consent Settings</h2>
+                                <h2 class="h5 mb-0"><span class="me-2" aria-hidden="true">&#9881;</span> Consent Settings</h2>
                             </div>
                             <div class="card-body">
                                 <p>Manage how we use your data and what you consent to.</p>
@@ -5206,7 +5302,7 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
                     <div class="col-md-4 mb-4">
                         <div class="card h-100 shadow-sm">
                             <div class="card-header bg-primary text-white">
-                                <h2 class="h5 mb-0"><i class="fas fa-download me-2"></i> Export Data</h2>
+                                <h2 class="h5 mb-0"><span class="me-2" aria-hidden="true">&#11015;</span> Export Data</h2>
                             </div>
                             <div class="card-body">
                                 <p>Download a copy of your personal data in a portable format.</p>
@@ -5221,7 +5317,7 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
                     <div class="col-md-4 mb-4">
                         <div class="card h-100 shadow-sm border-danger">
                             <div class="card-header bg-danger text-white">
-                                <h2 class="h5 mb-0"><i class="fas fa-trash-alt me-2"></i> Delete Data</h2>
+                                <h2 class="h5 mb-0"><span class="me-2" aria-hidden="true">&#128465;</span> Delete Data</h2>
                             </div>
                             <div class="card-body">
                                 <p>Request deletion of your personal data from our systems.</p>
@@ -5237,7 +5333,6 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
         """
@@ -5249,16 +5344,14 @@ def handle_gdpr_my_data(headers: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_consent_settings(headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR consent settings page"""
     try:
-        user_email = 'test@ieltsgenaiprep.com'
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
         consent_data = aws_mock.get_user_consent(user_email)
         
         html_content = f"""
@@ -5268,8 +5361,7 @@ def handle_gdpr_consent_settings(headers: Dict[str, Any]) -> Dict[str, Any]:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Consent Settings - IELTS GenAI Prep</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.2.1/css/all.min.css" rel="stylesheet">
+    {_GDPR_STYLE_TAG}
 </head>
 <body>
     <nav class="navbar navbar-expand-lg navbar-light bg-light">
@@ -5355,7 +5447,6 @@ def handle_gdpr_consent_settings(headers: Dict[str, Any]) -> Dict[str, Any]:
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
         """
@@ -5367,16 +5458,14 @@ def handle_gdpr_consent_settings(headers: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_update_consent(data: Dict[str, Any], headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR consent update"""
     try:
-        user_email = 'test@ieltsgenaiprep.com'
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
         
         consent_data = {
             'data_processing': True,
@@ -5389,31 +5478,27 @@ def handle_gdpr_update_consent(data: Dict[str, Any], headers: Dict[str, Any]) ->
         
         aws_mock.update_user_consent(user_email, consent_data)
         
+        # 303 so the browser follows up with a GET and never re-POSTs the form
         return {
-            'statusCode': 302,
-            'headers': {'Location': '/gdpr/my-data', 'Content-Type': 'text/html'},
+            'statusCode': 303,
+            'headers': _MY_DATA_REDIRECT_HEADERS,
             'body': ''
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_request_data_export(headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR data export request page"""
     try:
-        html_content = """
+        html_content = f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Request Data Export - IELTS GenAI Prep</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.2.1/css/all.min.css" rel="stylesheet">
+    {_GDPR_STYLE_TAG}
 </head>
 <body>
     <nav class="navbar navbar-expand-lg navbar-light bg-light">
@@ -5434,7 +5519,7 @@ def handle_gdpr_request_data_export(headers: Dict[str, Any]) -> Dict[str, Any]:
                         <div class="alert alert-info">
                             <div class="d-flex">
                                 <div class="me-3">
-                                    <i class="fas fa-info-circle fa-2x"></i>
+                                    <span class="icon-lg" aria-hidden="true">&#8505;</span>
                                 </div>
                                 <div>
                                     <h4>About Data Exports</h4>
@@ -5475,7 +5560,6 @@ def handle_gdpr_request_data_export(headers: Dict[str, Any]) -> Dict[str, Any]:
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
         """
@@ -5487,33 +5571,25 @@ def handle_gdpr_request_data_export(headers: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_export_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR data export processing"""
     try:
-        user_email = 'test@ieltsgenaiprep.com'
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
         export_format = data.get('format', 'json')
         include_assessments = data.get('include_assessments', False)
         
         request_id = aws_mock.request_data_export(user_email, export_format, include_assessments)
         
         if not request_id:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'text/html'},
-                'body': '<h1>Error</h1><p>Unable to process export request</p>'
-            }
+            return _error_response(400, 'Unable to process export request')
         
         export_request = aws_mock.get_gdpr_request_status(request_id)
         
         if export_request and export_request.get('status') == 'completed':
-            export_data = export_request.get('export_data', {})
-            
             if export_format == 'json':
                 return {
                     'statusCode': 200,
@@ -5521,10 +5597,11 @@ def handle_gdpr_export_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Di
                         'Content-Type': 'application/json',
                         'Content-Disposition': f'attachment; filename="ielts-data-export-{request_id}.json"'
                     },
-                    'body': json.dumps(export_data, indent=2)
+                    'body': ''.join(aws_mock.stream_export(request_id))
                 }
             else:
-                csv_content = f"Email,Created At,Last Login\\n{user_email},{export_data.get('user_profile', {}).get('created_at', '')},{export_data.get('user_profile', {}).get('last_login', '')}"
+                profile = (aws_mock.get_export_data(request_id) or {}).get('user_profile') or {}
+                csv_content = f"Email,Created At,Last Login\r\n{user_email},{profile.get('created_at') or ''},{profile.get('last_login') or ''}\r\n"
                 
                 return {
                     'statusCode': 200,
@@ -5535,31 +5612,22 @@ def handle_gdpr_export_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Di
                     'body': csv_content
                 }
         
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': '<h1>Error</h1><p>Export request failed</p>'
-        }
+        return _error_response(500, 'Export request failed')
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_request_data_deletion(headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR data deletion request page"""
     try:
-        html_content = """
+        html_content = f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Request Data Deletion - IELTS GenAI Prep</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.2.1/css/all.min.css" rel="stylesheet">
+    {_GDPR_STYLE_TAG}
 </head>
 <body>
     <nav class="navbar navbar-expand-lg navbar-light bg-light">
@@ -5574,13 +5642,13 @@ def handle_gdpr_request_data_deletion(headers: Dict[str, Any]) -> Dict[str, Any]
             <div class="col-lg-8 mx-auto">
                 <div class="card shadow border-warning">
                     <div class="card-header bg-warning text-dark">
-                        <h1 class="h3 mb-0"><i class="fas fa-exclamation-triangle me-2"></i>Request Data Deletion</h1>
+                        <h1 class="h3 mb-0"><span class="me-2" aria-hidden="true">&#9888;</span>Request Data Deletion</h1>
                     </div>
                     <div class="card-body">
                         <div class="alert alert-warning">
                             <div class="d-flex">
                                 <div class="me-3">
-                                    <i class="fas fa-exclamation-triangle fa-2x"></i>
+                                    <span class="icon-lg" aria-hidden="true">&#9888;</span>
                                 </div>
                                 <div>
                                     <h4>Important Notice</h4>
@@ -5618,7 +5686,6 @@ def handle_gdpr_request_data_deletion(headers: Dict[str, Any]) -> Dict[str, Any]
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
         """
@@ -5630,44 +5697,17 @@ def handle_gdpr_request_data_deletion(headers: Dict[str, Any]) -> Dict[str, Any]
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
-def handle_gdpr_delete_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle GDPR data deletion processing"""
-    try:
-        user_email = 'test@ieltsgenaiprep.com'
-        deletion_type = data.get('deletion_type', 'complete')
-        confirm_deletion = data.get('confirm_deletion', False)
-        
-        if not confirm_deletion:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'text/html'},
-                'body': '<h1>Error</h1><p>Deletion confirmation required</p>'
-            }
-        
-        request_id = aws_mock.request_data_deletion(user_email, deletion_type)
-        
-        if not request_id:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'text/html'},
-                'body': '<h1>Error</h1><p>Unable to process deletion request</p>'
-            }
-        
-        success_html = f"""
+# Deletion confirmation page, split around the request ID once at import
+_DELETION_SUCCESS_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Data Deletion Request Submitted - IELTS GenAI Prep</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.2.1/css/all.min.css" rel="stylesheet">
+""" + _GDPR_STYLE_TAG + """
 </head>
 <body>
     <nav class="navbar navbar-expand-lg navbar-light bg-light">
@@ -5681,13 +5721,13 @@ def handle_gdpr_delete_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Di
             <div class="col-lg-8 mx-auto">
                 <div class="card shadow border-success">
                     <div class="card-header bg-success text-white">
-                        <h1 class="h3 mb-0"><i class="fas fa-check-circle me-2"></i>Request Submitted</h1>
+                        <h1 class="h3 mb-0"><span class="me-2" aria-hidden="true">&#10004;</span>Request Submitted</h1>
                     </div>
                     <div class="card-body">
                         <div class="alert alert-success">
                             <div class="d-flex">
                                 <div class="me-3">
-                                    <i class="fas fa-check-circle fa-2x"></i>
+                                    <span class="icon-lg" aria-hidden="true">&#10004;</span>
                                 </div>
                                 <div>
                                     <h4>Deletion Request Submitted</h4>
@@ -5712,10 +5752,29 @@ def handle_gdpr_delete_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Di
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
-        """
+"""
+_DELETION_SUCCESS_PREFIX, _DELETION_SUCCESS_SUFFIX = _DELETION_SUCCESS_HTML.split('{request_id}')
+
+def handle_gdpr_delete_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle GDPR data deletion processing"""
+    try:
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
+        deletion_type = data.get('deletion_type', 'complete')
+        confirm_deletion = data.get('confirm_deletion', False)
+        
+        if not confirm_deletion:
+            return _error_response(400, 'Deletion confirmation required')
+        
+        request_id = aws_mock.request_data_deletion(user_email, deletion_type)
+        
+        if not request_id:
+            return _error_response(400, 'Unable to process deletion request')
+        
+        success_html = _DELETION_SUCCESS_PREFIX + request_id + _DELETION_SUCCESS_SUFFIX
         
         return {
             'statusCode': 200,
@@ -5724,16 +5783,14 @@ def handle_gdpr_delete_data(data: Dict[str, Any], headers: Dict[str, Any]) -> Di
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_cookie_preferences(headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR cookie preferences page"""
     try:
-        user_email = 'test@ieltsgenaiprep.com'
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
         cookie_prefs = aws_mock.get_cookie_preferences(user_email)
         
         html_content = f"""
@@ -5743,8 +5800,7 @@ def handle_gdpr_cookie_preferences(headers: Dict[str, Any]) -> Dict[str, Any]:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Cookie Preferences - IELTS GenAI Prep</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.2.1/css/all.min.css" rel="stylesheet">
+    {_GDPR_STYLE_TAG}
 </head>
 <body>
     <nav class="navbar navbar-expand-lg navbar-light bg-light">
@@ -5830,7 +5886,6 @@ def handle_gdpr_cookie_preferences(headers: Dict[str, Any]) -> Dict[str, Any]:
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
         """
@@ -5842,16 +5897,14 @@ def handle_gdpr_cookie_preferences(headers: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
+        return _error_response(500, html_escape(str(e)))
 
 def handle_gdpr_update_cookies(data: Dict[str, Any], headers: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GDPR cookie preferences update"""
     try:
-        user_email = 'test@ieltsgenaiprep.com'
+        user_email = get_gdpr_user_email(headers)
+        if not user_email:
+            return _login_redirect()
         
         cookie_prefs = {
             'functional': data.get('functional', False),
@@ -5861,15 +5914,12 @@ def handle_gdpr_update_cookies(data: Dict[str, Any], headers: Dict[str, Any]) ->
         
         aws_mock.update_cookie_preferences(user_email, cookie_prefs)
         
+        # 303 so the browser follows up with a GET and never re-POSTs the form
         return {
-            'statusCode': 302,
-            'headers': {'Location': '/gdpr/my-data', 'Content-Type': 'text/html'},
+            'statusCode': 303,
+            'headers': _MY_DATA_REDIRECT_HEADERS,
             'body': ''
         }
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'text/html'},
-            'body': f'<h1>Error</h1><p>{str(e)}</p>'
-        }
\ No newline at end of file
+        return _error_response(500, html_escape(str(e)))
\ No newline at end of file
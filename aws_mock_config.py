@@ -8,22 +8,282 @@ import json
 import time
 import uuid
 import random
+import sys
+import atexit
+import heapq
+import logging
+import weakref
 import bcrypt
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from itertools import count, islice
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Iterator, List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dedicated generator for question picking
+_rng = random.Random()
+
+# Clock and id factories bound once for the request paths
+_utcnow = datetime.utcnow
+_uuid4 = uuid.uuid4
+
+# bcrypt hash of the development test user's password ('testpassword123'),
+# precomputed so start-up does not pay for a cost-12 hashpw()
+TEST_USER_PASSWORD_HASH = '$2b$12$N1ek.5TQ6P5LMsJUcq3tYu4lCsXSH0u8sB8KleXT.5TkcitmmFyTu'
+
+# (epoch second, ISO string) of the last formatted timestamp
+_iso_cache = (0, '')
+
+def now_iso() -> str:
+    """Current UTC time as an ISO-8601 string, formatted at most once per second"""
+    global _iso_cache
+    now = int(time.time())
+    cached_second, cached_iso = _iso_cache
+    if now != cached_second:
+        cached_iso = datetime.utcfromtimestamp(now).isoformat()
+        _iso_cache = (now, cached_iso)
+    return cached_iso
+
+# IELTS assessment rubrics for Nova Sonic and Nova Micro. These are static,
+# read-only data, so they live at module level rather than in the mock table.
+
+# IELTS Speaking Assessment Rubrics (for Nova Sonic)
+_SPEAKING_RUBRICS = {
+    'academic_speaking': {
+        'rubric_id': 'ielts_academic_speaking_v2024',
+        'assessment_type': 'speaking',
+        'criteria': {
+            'fluency_and_coherence': {
+                'band_9': 'Speaks fluently with only rare repetition or self-correction. Develops topics coherently and appropriately.',
+                'band_8': 'Speaks fluently with only occasional repetition or self-correction. Develops topics coherently.',
+                'band_7': 'Speaks at length without noticeable effort or loss of coherence. Uses linking words effectively.',
+                'band_6': 'Speaks at length though may show hesitation. Generally coherent but may lack progression.',
+                'band_5': 'Usually maintains flow but uses repetition and hesitation. Over-uses linking words.',
+                'band_4': 'Cannot respond without noticeable pauses. Speech may be slow with frequent repetition.',
+                'descriptors': ['flow', 'pace', 'coherence', 'topic_development', 'linking_devices']
+            },
+            'lexical_resource': {
+                'band_9': 'Uses vocabulary with full flexibility and precise usage in all topics.',
+                'band_8': 'Uses wide range of vocabulary fluently and flexibly to convey precise meanings.',
+                'band_7': 'Uses vocabulary resource flexibly to discuss variety of topics.',
+                'band_6': 'Has wide enough vocabulary to discuss topics at length.',
+                'band_5': 'Manages to talk about familiar topics but uses vocabulary inappropriately.',
+                'band_4': 'Limited vocabulary prevents discussion of unfamiliar topics.',
+                'descriptors': ['range', 'accuracy', 'flexibility', 'appropriacy', 'paraphrase_ability']
+            },
+            'grammatical_range_and_accuracy': {
+                'band_9': 'Uses wide range of structures with full flexibility and accuracy.',
+                'band_8': 'Uses wide range of structures flexibly with majority error-free.',
+                'band_7': 'Uses range of complex structures with some flexibility.',
+                'band_6': 'Uses mix of simple and complex structures with some errors.',
+                'band_5': 'Uses basic sentence forms with reasonable accuracy.',
+                'band_4': 'Uses only basic sentence forms with frequent errors.',
+                'descriptors': ['complexity', 'range', 'accuracy', 'error_frequency', 'communication_impact']
+            },
+            'pronunciation': {
+                'band_9': 'Uses wide range of pronunciation features with precise control.',
+                'band_8': 'Uses wide range of pronunciation features flexibly.',
+                'band_7': 'Shows all positive features and sustained ability.',
+                'band_6': 'Uses range of pronunciation features with mixed control.',
+                'band_5': 'Shows some effective use of features but not sustained.',
+                'band_4': 'Limited range of pronunciation features.',
+                'descriptors': ['individual_sounds', 'word_stress', 'sentence_stress', 'intonation', 'chunking']
+            }
+        },
+        'nova_sonic_prompts': {
+            'system_prompt': 'You are Maya, an experienced IELTS examiner conducting a speaking assessment. Follow IELTS speaking test format with Part 1 (familiar topics), Part 2 (long turn), and Part 3 (abstract discussion). Evaluate based on fluency, vocabulary, grammar, and pronunciation.',
+            'part_1_topics': ['work', 'studies', 'hometown', 'family', 'hobbies', 'food', 'transport', 'weather'],
+            'part_2_structure': 'Give candidate cue card with topic, 1 minute preparation, 2 minutes speaking',
+            'part_3_approach': 'Ask abstract questions related to Part 2 topic, probe deeper understanding'
+        }
+    },
+    'general_speaking': {
+        'rubric_id': 'ielts_general_speaking_v2024',
+        'assessment_type': 'speaking',
+        'criteria': {
+            # Same criteria as academic but with different topics and contexts
+            'fluency_and_coherence': {
+                'band_9': 'Speaks fluently with only rare repetition or self-correction. Develops topics coherently and appropriately.',
+                'band_8': 'Speaks fluently with only occasional repetition or self-correction. Develops topics coherently.',
+                'band_7': 'Speaks at length without noticeable effort or loss of coherence. Uses linking words effectively.',
+                'band_6': 'Speaks at length though may show hesitation. Generally coherent but may lack progression.',
+                'band_5': 'Usually maintains flow but uses repetition and hesitation. Over-uses linking words.',
+                'band_4': 'Cannot respond without noticeable pauses. Speech may be slow with frequent repetition.',
+                'descriptors': ['flow', 'pace', 'coherence', 'topic_development', 'linking_devices']
+            }
+        },
+        'nova_sonic_prompts': {
+            'system_prompt': 'You are Maya, an IELTS examiner for General Training. Focus on everyday situations, practical English usage, and social contexts.',
+            'part_1_topics': ['daily_routine', 'shopping', 'travel', 'entertainment', 'sports', 'technology'],
+            'part_2_structure': 'Practical topics like describing experiences, places, people',
+            'part_3_approach': 'Discuss practical implications and everyday applications'
+        }
+    }
+}
+
+# IELTS Writing Assessment Rubrics (for Nova Micro)
+_WRITING_RUBRICS = {
+    'academic_writing': {
+        'rubric_id': 'ielts_academic_writing_v2024',
+        'assessment_type': 'writing',
+        'task_1': {
+            'task_achievement': {
+                'band_9': 'Fully satisfies all requirements. Clearly presents fully developed response.',
+                'band_8': 'Covers requirements sufficiently. Clearly presents well-developed response.',
+                'band_7': 'Covers requirements. Clearly presents key features/bullet points.',
+                'band_6': 'Addresses requirements with some omissions. Format appropriate.',
+                'band_5': 'Generally addresses requirements. Format may be inappropriate.',
+                'band_4': 'Attempts to address requirements but fails to cover all.',
+                'descriptors': ['completeness', 'appropriacy', 'accuracy', 'overview', 'key_features']
+            }
+        },
+        'task_2': {
+            'task_response': {
+                'band_9': 'Fully addresses all parts. Develops clear, comprehensive arguments.',
+                'band_8': 'Sufficiently addresses all parts. Develops relevant arguments.',
+                'band_7': 'Addresses all parts though some more than others.',
+                'band_6': 'Addresses all parts but some may be more developed.',
+                'band_5': 'Addresses the task only partially. Limited development.',
+                'band_4': 'Responds to task but in limited way.',
+                'descriptors': ['position_clarity', 'argument_development', 'examples', 'conclusion']
+            }
+        },
+        'nova_micro_prompts': {
+            'system_prompt': 'You are an IELTS Academic Writing examiner. Evaluate Task Achievement/Response, Coherence and Cohesion, Lexical Resource, and Grammatical Range and Accuracy. Provide band scores (1-9) and detailed feedback.',
+            'task_1_requirements': 'Describe visual information (graphs, charts, diagrams). Minimum 150 words. Academic tone.',
+            'task_2_requirements': 'Present argument or discussion. Minimum 250 words. Academic essay structure.'
+        }
+    }
+}
+
+_RUBRICS = MappingProxyType({
+    assessment_type: MappingProxyType(rubric)
+    for assessment_type, rubric in {**_SPEAKING_RUBRICS, **_WRITING_RUBRICS}.items()
+})
+
+# Nova prompt sections of each rubric, projected once
+_NOVA_SONIC_PROMPTS = MappingProxyType({
+    assessment_type: rubric.get('nova_sonic_prompts')
+    for assessment_type, rubric in _RUBRICS.items()
+})
+_NOVA_MICRO_PROMPTS = MappingProxyType({
+    assessment_type: rubric.get('nova_micro_prompts')
+    for assessment_type, rubric in _RUBRICS.items()
+})
+
+# Map product IDs to assessment types
+_PRODUCT_ASSESSMENT_MAP = MappingProxyType({
+    'com.ieltsgenaiprep.academic.writing': 'academic_writing',
+    'com.ieltsgenaiprep.general.writing': 'general_writing',
+    'com.ieltsgenaiprep.academic.speaking': 'academic_speaking',
+    'com.ieltsgenaiprep.general.speaking': 'general_speaking',
+    'academic_writing_assessment': 'academic_writing',
+    'general_writing_assessment': 'general_writing',
+    'academic_speaking_assessment': 'academic_speaking',
+    'general_speaking_assessment': 'general_speaking'
+})
+
+# Assessments reported for users without purchase records (testing default)
+_DEFAULT_ASSESSMENTS = MappingProxyType({
+    'academic_writing': MappingProxyType({'attempts_left': 4, 'total_attempts': 4}),
+    'general_writing': MappingProxyType({'attempts_left': 4, 'total_attempts': 4}),
+    'academic_speaking': MappingProxyType({'attempts_left': 4, 'total_attempts': 4}),
+    'general_speaking': MappingProxyType({'attempts_left': 4, 'total_attempts': 4})
+})
+
+# Comprehensive question banks per assessment type, kept in a JSON sidecar
+_QUESTION_BANKS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'question_banks.json')
+
+@lru_cache(maxsize=1)
+def _load_question_banks():
+    """Load the question banks on first use as read-only views, with the
+    question ids per assessment type and every question by its id"""
+    # Repeated values ('Task 2', '4-5 minutes', ...) share one string object.
+    # Keys and identifier-like values (question ids, assessment types) are
+    # interned so they are the same objects as the literals used for lookups.
+    # Nested arrays such as speaking parts are frozen into tuples
+    symbols = {}
+    
+    def canonical(value):
+        if not isinstance(value, str):
+            return value
+        if value.isidentifier():
+            return sys.intern(value)
+        return symbols.setdefault(value, value)
+    
+    def canonical_object(obj):
+        return {
+            sys.intern(key): tuple(canonical(v) for v in value) if isinstance(value, list) else canonical(value)
+            for key, value in obj.items()
+        }
+    
+    with open(_QUESTION_BANKS_PATH, 'r', encoding='utf-8') as f:
+        raw_banks = json.load(f, object_hook=canonical_object)
+    
+    banks = MappingProxyType({
+        assessment_type: tuple(MappingProxyType(question) for question in bank)
+        for assessment_type, bank in raw_banks.items()
+    })
+    ids_by_type = MappingProxyType({
+        assessment_type: tuple(q['question_id'] for q in bank)
+        for assessment_type, bank in banks.items()
+    })
+    by_id = MappingProxyType({
+        q['question_id']: q
+        for bank in banks.values()
+        for q in bank
+    })
+    return banks, ids_by_type, by_id
+
+# Serialises GDPR exports; read-only mappings are emitted as plain objects
+_EXPORT_ENCODER = json.JSONEncoder(indent=2, default=dict)
+
+# Consent and cookie settings reported for users who have not saved any
+_DEFAULT_CONSENT = MappingProxyType({
+    'data_processing': True,  # Required for service
+    'audio_processing': True,
+    'marketing_emails': False,
+    'analytics': False,
+    'third_party_sharing': False
+})
+_DEFAULT_COOKIE_PREFERENCES = MappingProxyType({
+    'necessary': True,  # Always required
+    'functional': True,
+    'analytics': False,
+    'marketing': False
+})
+
+# Item attribute names written or read on every table operation
+_CREATED_AT_KEY = '_created_at'
+_TABLE_KEY = '_table'
+_TTL_KEY = 'ttl'
+_EXPIRES_AT_KEY = 'expires_at'
 
 class MockDynamoDBTable:
     """Simulates DynamoDB table with TTL support"""
     
-    def __init__(self, table_name: str):
+    def __init__(self, table_name: str, key_attribute: Optional[str] = None):
         self.table_name = table_name
+        self.key_attribute = key_attribute
         self.items = {}
+        # attribute -> value -> [item keys], plus the value each key was indexed under
         self.gsi_indexes = {}
+        self._gsi_values = {}
+        # Min-heap of (ttl, key) so expiry only touches items that are due;
+        # entries superseded by a later write are skipped via _expiry_version
+        self._expiry_heap = []
+        self._expiry_version = {}
     
     def put_item(self, item: Dict[str, Any]) -> bool:
         """Store item with automatic TTL cleanup"""
         # For users table, use email as key; for others, use their primary key
-        if self.table_name == 'ielts-genai-prep-users':
+        if self.key_attribute:
+            item_key = item.get(self.key_attribute)
+        elif self.table_name == 'ielts-genai-prep-users':
             item_key = item.get('email')
         else:
             item_key = item.get('user_id', item.get('session_id', item.get('email')))
@@ -32,13 +292,18 @@ class MockDynamoDBTable:
             return False
         
         # Add DynamoDB metadata
-        item['_created_at'] = time.time()
-        item['_table'] = self.table_name
+        item[_CREATED_AT_KEY] = time.time()
+        item[_TABLE_KEY] = self.table_name
+        
+        if self.gsi_indexes:
+            self._unindex_gsi(item_key)
+            self._index_gsi(item_key, item)
         
         self.items[item_key] = item
+        self._index_expiry(item_key, item)
         self._cleanup_expired_items()
         
-        print(f"[DYNAMODB] PUT {self.table_name}: {item_key}")
+        logger.debug("[DYNAMODB] PUT %s: %s", self.table_name, item_key)
         return True
     
     def get_item(self, key: str) -> Optional[Dict[str, Any]]:
@@ -47,25 +312,37 @@ class MockDynamoDBTable:
         item = self.items.get(key)
         
         if item:
-            print(f"[DYNAMODB] GET {self.table_name}: {key} -> Found")
+            logger.debug("[DYNAMODB] GET %s: %s -> Found", self.table_name, key)
             return item
         else:
-            print(f"[DYNAMODB] GET {self.table_name}: {key} -> Not Found")
+            logger.debug("[DYNAMODB] GET %s: %s -> Not Found", self.table_name, key)
             return None
     
     def delete_item(self, key: str) -> bool:
         """Delete item"""
         if key in self.items:
             del self.items[key]
-            print(f"[DYNAMODB] DELETE {self.table_name}: {key}")
+            self._expiry_version.pop(key, None)
+            self._unindex_gsi(key)
+            logger.debug("[DYNAMODB] DELETE %s: %s", self.table_name, key)
             return True
         return False
     
-    def update_item(self, key: str, updates: Dict[str, Any]) -> bool:
-        """Update existing item"""
+    def update_item(self, key: str, updates: Optional[Dict[str, Any]] = None,
+                    list_appends: Optional[Dict[str, list]] = None) -> bool:
+        """Update existing item; list_appends extends list attributes in place (list_append)"""
         if key in self.items:
-            self.items[key].update(updates)
-            print(f"[DYNAMODB] UPDATE {self.table_name}: {key}")
+            item = self.items[key]
+            updates = updates or {}
+            item.update(updates)
+            for attr, values in (list_appends or {}).items():
+                item.setdefault(attr, []).extend(values)
+            if any(attr in updates for attr in self.gsi_indexes):
+                self._unindex_gsi(key)
+                self._index_gsi(key, item)
+            if _TTL_KEY in updates or _EXPIRES_AT_KEY in updates:
+                self._index_expiry(key, item)
+            logger.debug("[DYNAMODB] UPDATE %s: %s", self.table_name, key)
             return True
         return False
     
@@ -73,47 +350,135 @@ class MockDynamoDBTable:
         """Scan table with optional filtering"""
         self._cleanup_expired_items()
         items = list(self.items.values())
-        print(f"[DYNAMODB] SCAN {self.table_name}: {len(items)} items")
+        logger.debug("[DYNAMODB] SCAN %s: %d items", self.table_name, len(items))
         return items
     
+    def iter_items(self, *, batch_size: int = 100, filter_fn=None,
+                   exclusive_start_key: Optional[str] = None):
+        """Scan the table page by page, yielding (items, last_evaluated_key);
+        the key is None on the final page and resumes the scan when passed
+        back as exclusive_start_key"""
+        self._cleanup_expired_items()
+        # Snapshot the keys so callers may write to the table between pages
+        keys = list(self.items)
+        if exclusive_start_key is not None:
+            # Items keep insertion order, so resume just after the start key
+            if exclusive_start_key not in self.items:
+                logger.warning("[DYNAMODB] SCAN_PAGE %s: unknown start key %s", self.table_name, exclusive_start_key)
+                return
+            keys = keys[keys.index(exclusive_start_key) + 1:]
+        for start in range(0, len(keys), batch_size):
+            page_keys = keys[start:start + batch_size]
+            batch = [
+                item for item in map(self.items.get, page_keys)
+                if item is not None and (filter_fn is None or filter_fn(item))
+            ]
+            last_key = page_keys[-1] if start + batch_size < len(keys) else None
+            logger.debug("[DYNAMODB] SCAN_PAGE %s: %d items", self.table_name, len(batch))
+            yield batch, last_key
+    
+    @property
+    def item_count(self) -> int:
+        """Number of stored items, without scanning"""
+        return len(self.items)
+    
+    def create_gsi(self, attribute_name: str):
+        """Register a secondary index on an attribute and backfill existing items"""
+        self.gsi_indexes[attribute_name] = {}
+        self._gsi_values[attribute_name] = {}
+        for key, item in self.items.items():
+            self._index_gsi(key, item, (attribute_name,))
+    
+    def query_gsi(self, attribute_name: str, value: Any) -> list:
+        """Return items whose indexed attribute equals value"""
+        items = list(self.iter_gsi(attribute_name, value))
+        logger.debug("[DYNAMODB] QUERY %s: %s -> %d items", self.table_name, attribute_name, len(items))
+        return items
+    
+    def iter_gsi(self, attribute_name: str, value: Any):
+        """Lazily yield items whose indexed attribute equals value"""
+        self._cleanup_expired_items()
+        # Snapshot the matching keys so callers may delete while iterating
+        for key in tuple(self.gsi_indexes[attribute_name].get(value, ())):
+            item = self.items.get(key)
+            if item is not None:
+                yield item
+    
+    def _index_gsi(self, key: str, item: Dict[str, Any], attributes=None):
+        """Add the item to each secondary index whose attribute it carries"""
+        for attr in attributes or self.gsi_indexes:
+            value = item.get(attr)
+            if value is not None:
+                self.gsi_indexes[attr].setdefault(value, []).append(key)
+                self._gsi_values[attr][key] = value
+    
+    def _unindex_gsi(self, key: str):
+        """Remove the key from every secondary index"""
+        for attr, values in self._gsi_values.items():
+            value = values.pop(key, None)
+            if value is not None:
+                keys = self.gsi_indexes[attr][value]
+                keys.remove(key)
+                if not keys:
+                    del self.gsi_indexes[attr][value]
+    
+    def _index_expiry(self, key: str, item: Dict[str, Any]):
+        """Track the item's TTL in the expiry heap"""
+        ttl = item.get(_TTL_KEY, item.get(_EXPIRES_AT_KEY))
+        if ttl:
+            heapq.heappush(self._expiry_heap, (ttl, key))
+            self._expiry_version[key] = ttl
+        else:
+            self._expiry_version.pop(key, None)
+    
     def _cleanup_expired_items(self):
         """Remove items past their TTL"""
-        current_time = time.time()
-        expired_keys = []
+        heap = self._expiry_heap
+        if not heap:
+            return
         
-        for key, item in self.items.items():
-            ttl = item.get('ttl', item.get('expires_at'))
-            if ttl and current_time > ttl:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
+        current_time = time.time()
+        while heap and current_time > heap[0][0]:
+            ttl, key = heapq.heappop(heap)
+            # Stale entry: the item was rewritten, deleted or its TTL changed
+            if self._expiry_version.get(key) != ttl:
+                continue
+            
+            del self._expiry_version[key]
             del self.items[key]
-            print(f"[DYNAMODB] TTL_EXPIRED {self.table_name}: {key}")
+            self._unindex_gsi(key)
+            logger.debug("[DYNAMODB] TTL_EXPIRED %s: %s", self.table_name, key)
 
 class MockElastiCache:
     """Simulates ElastiCache Redis for session storage"""
     
+    # Like Redis, expire accessed keys lazily and sweep the rest periodically
+    SWEEP_INTERVAL_OPS = 1024
+    
     def __init__(self):
         self.cache = {}
         self.expirations = {}
+        self._ops_since_sweep = 0
     
     def set(self, key: str, value: Any, ex: int = 3600) -> bool:
         """Set key with expiration"""
         self.cache[key] = value
         self.expirations[key] = time.time() + ex
-        print(f"[ELASTICACHE] SET {key} (expires in {ex}s)")
+        logger.debug("[ELASTICACHE] SET %s (expires in %ss)", key, ex)
+        self._count_op()
         return True
     
     def get(self, key: str) -> Optional[Any]:
         """Get key if not expired"""
-        self._cleanup_expired()
+        self._count_op()
+        self._expire_if_due(key)
         value = self.cache.get(key)
         
         if value:
-            print(f"[ELASTICACHE] GET {key} -> Found")
+            logger.debug("[ELASTICACHE] GET %s -> Found", key)
             return value
         else:
-            print(f"[ELASTICACHE] GET {key} -> Not Found")
+            logger.debug("[ELASTICACHE] GET %s -> Not Found", key)
             return None
     
     def delete(self, key: str) -> bool:
@@ -122,15 +487,15 @@ class MockElastiCache:
             del self.cache[key]
             if key in self.expirations:
                 del self.expirations[key]
-            print(f"[ELASTICACHE] DELETE {key}")
+            logger.debug("[ELASTICACHE] DELETE %s", key)
             return True
         return False
     
     def exists(self, key: str) -> bool:
         """Check if key exists and not expired"""
-        self._cleanup_expired()
+        self._expire_if_due(key)
         exists = key in self.cache
-        print(f"[ELASTICACHE] EXISTS {key} -> {exists}")
+        logger.debug("[ELASTICACHE] EXISTS %s -> %s", key, exists)
         return exists
     
     def ttl(self, key: str) -> int:
@@ -141,6 +506,21 @@ class MockElastiCache:
         remaining = int(self.expirations[key] - time.time())
         return max(0, remaining)
     
+    def _expire_if_due(self, key: str):
+        """Evict a single key if its expiration has passed"""
+        expiry = self.expirations.get(key)
+        if expiry is not None and time.time() > expiry:
+            self.cache.pop(key, None)
+            del self.expirations[key]
+            logger.debug("[ELASTICACHE] EXPIRED %s", key)
+    
+    def _count_op(self):
+        """Run a full sweep every SWEEP_INTERVAL_OPS operations"""
+        self._ops_since_sweep += 1
+        if self._ops_since_sweep >= self.SWEEP_INTERVAL_OPS:
+            self._ops_since_sweep = 0
+            self._cleanup_expired()
+    
     def _cleanup_expired(self):
         """Remove expired keys"""
         current_time = time.time()
@@ -154,14 +534,91 @@ class MockElastiCache:
             if key in self.cache:
                 del self.cache[key]
             del self.expirations[key]
-            print(f"[ELASTICACHE] EXPIRED {key}")
+            logger.debug("[ELASTICACHE] EXPIRED %s", key)
+
+@dataclass(slots=True)
+class LogEntry:
+    """Single CloudWatch log event"""
+    timestamp: int
+    message: str
+    ingestionTime: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@dataclass(slots=True)
+class MetricEntry:
+    """Single CloudWatch metric datum"""
+    namespace: str
+    metric_name: str
+    value: Any
+    unit: str
+    timestamp: datetime
+    dimensions: list = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@dataclass(slots=True)
+class Purchase:
+    """A user's purchase of one assessment type"""
+    product_id: Optional[str] = None
+    assessment_type: str = ''
+    purchase_date: str = ''
+    platform: str = 'mobile'
+    receipt_data: Any = None
+    assessments_remaining: int = 4
+    assessments_used: int = 0
+    price: float = 49.99
+    currency: str = 'USD'
+    last_used: str = ''
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    def reset(self):
+        """Restore every field to its default so the record can be reused"""
+        for f in fields(self):
+            setattr(self, f.name, f.default)
+
+@dataclass(slots=True)
+class CompletedAssessment:
+    """A completed assessment on a user record; its question counts as used"""
+    assessment_type: str
+    question_id: str
+    completed_at: str
+    result_data: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+# Live CloudWatch mocks, held weakly so throwaway instances can still be collected
+_live_cloudwatch = weakref.WeakSet()
+
+@atexit.register
+def _flush_live_cloudwatch():
+    """Don't lose events still queued when the process exits"""
+    for cloudwatch in list(_live_cloudwatch):
+        cloudwatch.flush_logs()
 
 class MockCloudWatch:
     """Simulates CloudWatch logging and metrics"""
     
+    # Retention caps so a long-running mock server doesn't grow without bound
+    LOG_STREAM_MAX_EVENTS = 10_000
+    METRICS_MAX_ENTRIES = 100_000
+    
+    # Queued log events are written in batches of this size, or once this
+    # many seconds have passed since the last flush
+    LOG_FLUSH_MAX_EVENTS = 100
+    LOG_FLUSH_INTERVAL = 1.0
+    
     def __init__(self):
         self.log_groups = {}
-        self.metrics = []
+        self.metrics = deque(maxlen=self.METRICS_MAX_ENTRIES)
+        self._pending_logs = deque()
+        self._last_flush_ts = time.time()
+        _live_cloudwatch.add(self)
     
     def put_log_events(self, log_group: str, log_stream: str, events: list):
         """Store log events"""
@@ -169,62 +626,113 @@ class MockCloudWatch:
             self.log_groups[log_group] = {}
         
         if log_stream not in self.log_groups[log_group]:
-            self.log_groups[log_group][log_stream] = []
+            self.log_groups[log_group][log_stream] = deque(maxlen=self.LOG_STREAM_MAX_EVENTS)
         
+        now_ms = time.time_ns() // 1_000_000
         for event in events:
-            log_entry = {
-                'timestamp': event.get('timestamp', int(time.time() * 1000)),
-                'message': event.get('message', ''),
-                'ingestionTime': int(time.time() * 1000)
-            }
+            log_entry = LogEntry(
+                timestamp=event.get('timestamp', now_ms),
+                message=event.get('message', ''),
+                ingestionTime=now_ms
+            )
             self.log_groups[log_group][log_stream].append(log_entry)
         
-        print(f"[CLOUDWATCH] LOGS {log_group}/{log_stream}: {len(events)} events")
+        logger.debug("[CLOUDWATCH] LOGS %s/%s: %d events", log_group, log_stream, len(events))
+    
+    def queue_log_event(self, log_group: str, log_stream: str, event: Dict[str, Any]):
+        """Buffer a log event and flush the buffer when it is full or stale"""
+        self._pending_logs.append((log_group, log_stream, event))
+        if (len(self._pending_logs) >= self.LOG_FLUSH_MAX_EVENTS
+                or time.time() - self._last_flush_ts > self.LOG_FLUSH_INTERVAL):
+            self.flush_logs()
+    
+    def flush_logs(self):
+        """Write buffered log events with one put_log_events call per stream"""
+        batches = {}
+        pending = self._pending_logs
+        while pending:
+            log_group, log_stream, event = pending.popleft()
+            batches.setdefault((log_group, log_stream), []).append(event)
+        
+        for (log_group, log_stream), events in batches.items():
+            self.put_log_events(log_group, log_stream, events)
+        self._last_flush_ts = time.time()
     
     def put_metric_data(self, namespace: str, metric_data: list):
         """Store metrics"""
         for metric in metric_data:
-            metric_entry = {
-                'namespace': namespace,
-                'metric_name': metric.get('MetricName'),
-                'value': metric.get('Value'),
-                'unit': metric.get('Unit', 'Count'),
-                'timestamp': metric.get('Timestamp', datetime.utcnow()),
-                'dimensions': metric.get('Dimensions', [])
-            }
+            metric_entry = MetricEntry(
+                namespace=namespace,
+                metric_name=metric.get('MetricName'),
+                value=metric.get('Value'),
+                unit=metric.get('Unit', 'Count'),
+                timestamp=metric.get('Timestamp', _utcnow()),
+                dimensions=metric.get('Dimensions', [])
+            )
             self.metrics.append(metric_entry)
         
-        print(f"[CLOUDWATCH] METRICS {namespace}: {len(metric_data)} metrics")
+        logger.debug("[CLOUDWATCH] METRICS %s: %d metrics", namespace, len(metric_data))
     
     def get_recent_logs(self, log_group: str, limit: int = 100) -> list:
         """Get recent log entries"""
+        if self._pending_logs:
+            self.flush_logs()
+        
         if log_group not in self.log_groups:
             return []
         
-        all_logs = []
-        for stream_logs in self.log_groups[log_group].values():
-            all_logs.extend(stream_logs)
-        
-        # Sort by timestamp and return most recent
-        all_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        return all_logs[:limit]
+        # Streams are appended in time order, so merge them newest-first and
+        # stop after limit entries instead of sorting the whole group
+        newest_first = heapq.merge(
+            *(reversed(stream_logs) for stream_logs in self.log_groups[log_group].values()),
+            key=lambda x: x.timestamp,
+            reverse=True
+        )
+        return [log_entry.to_dict() for log_entry in islice(newest_first, limit)]
 
 class AWSMockServices:
     """Central configuration for all AWS mock services"""
     
+    # In-process LRU in front of ElastiCache for hot session reads
+    SESSION_L1_TTL = 2.0
+    SESSION_L1_MAX_ENTRIES = 10_000
+    
+    # Coarsen last_login so back-to-back logins don't each write the user record
+    LAST_LOGIN_WRITE_INTERVAL = 60
+    
+    # Cap on recycled purchase records kept for reuse
+    PURCHASE_POOL_MAX = 64
+    
+    # Cap on per-user assessment count snapshots kept in memory
+    COUNTS_CACHE_MAX_ENTRIES = 10_000
+    
+    # Seconds a generated data export stays available for download
+    EXPORT_BLOB_TTL = 3600
+    
     def __init__(self):
         # DynamoDB Tables
         self.users_table = MockDynamoDBTable('ielts-genai-prep-users')
-        self.assessment_results_table = MockDynamoDBTable('ielts-genai-prep-assessment-results')
+        self.assessment_results_table = MockDynamoDBTable('ielts-genai-prep-assessment-results', key_attribute='assessment_id')
+        self.assessment_results_table.create_gsi('user_email')
         self.assessment_rubrics_table = MockDynamoDBTable('ielts-genai-prep-assessment-rubrics')
         
         # GDPR Compliance Tables
-        self.gdpr_consents_table = MockDynamoDBTable('ielts-genai-prep-gdpr-consents')
-        self.gdpr_data_requests_table = MockDynamoDBTable('ielts-genai-prep-gdpr-data-requests')
-        self.gdpr_cookie_preferences_table = MockDynamoDBTable('ielts-genai-prep-cookie-preferences')
+        self.gdpr_consents_table = MockDynamoDBTable('ielts-genai-prep-gdpr-consents', key_attribute='user_email')
+        self.gdpr_data_requests_table = MockDynamoDBTable('ielts-genai-prep-gdpr-data-requests', key_attribute='request_id')
+        self.gdpr_data_requests_table.create_gsi('user_email')
+        self.gdpr_cookie_preferences_table = MockDynamoDBTable('ielts-genai-prep-cookie-preferences', key_attribute='user_email')
+        # request_id -> export document, kept out of the request record (S3-style)
+        self._export_blobs = MockElastiCache()
         
         # ElastiCache
         self.session_cache = MockElastiCache()
+        self._session_l1 = OrderedDict()
+        # user_email -> session IDs, so a user's sessions can be revoked directly
+        self.user_sessions = defaultdict(set)
+        self._purchase_pool = []
+        # user_email -> (purchases version, read-only assessment counts), LRU-bounded
+        self._counts_cache = OrderedDict()
+        self._purchase_versions = count(1)
         
         # CloudWatch
         self.cloudwatch = MockCloudWatch()
@@ -233,158 +741,38 @@ class AWSMockServices:
         self.region = os.environ.get('AWS_REGION', 'us-east-1')
         self.account_id = '123456789012'  # Mock account ID
         
-        # Initialize IELTS assessment rubrics
-        self._setup_assessment_data()
-        
-        print(f"[AWS_MOCK] Services initialized for region: {self.region}")
-        print(f"[AWS_MOCK] GDPR compliance tables initialized")
+        logger.info("[AWS_MOCK] Services initialized for region: %s", self.region)
+        logger.info("[AWS_MOCK] GDPR compliance tables initialized")
         
         # Create test user for development
         self._create_test_user()
     
-    def _setup_assessment_data(self):
-        """Initialize IELTS assessment rubrics for Nova Sonic and Nova Micro"""
-        
-        # IELTS Speaking Assessment Rubrics (for Nova Sonic)
-        speaking_rubrics = {
-            'academic_speaking': {
-                'rubric_id': 'ielts_academic_speaking_v2024',
-                'assessment_type': 'speaking',
-                'criteria': {
-                    'fluency_and_coherence': {
-                        'band_9': 'Speaks fluently with only rare repetition or self-correction. Develops topics coherently and appropriately.',
-                        'band_8': 'Speaks fluently with only occasional repetition or self-correction. Develops topics coherently.',
-                        'band_7': 'Speaks at length without noticeable effort or loss of coherence. Uses linking words effectively.',
-                        'band_6': 'Speaks at length though may show hesitation. Generally coherent but may lack progression.',
-                        'band_5': 'Usually maintains flow but uses repetition and hesitation. Over-uses linking words.',
-                        'band_4': 'Cannot respond without noticeable pauses. Speech may be slow with frequent repetition.',
-                        'descriptors': ['flow', 'pace', 'coherence', 'topic_development', 'linking_devices']
-                    },
-                    'lexical_resource': {
-                        'band_9': 'Uses vocabulary with full flexibility and precise usage in all topics.',
-                        'band_8': 'Uses wide range of vocabulary fluently and flexibly to convey precise meanings.',
-                        'band_7': 'Uses vocabulary resource flexibly to discuss variety of topics.',
-                        'band_6': 'Has wide enough vocabulary to discuss topics at length.',
-                        'band_5': 'Manages to talk about familiar topics but uses vocabulary inappropriately.',
-                        'band_4': 'Limited vocabulary prevents discussion of unfamiliar topics.',
-                        'descriptors': ['range', 'accuracy', 'flexibility', 'appropriacy', 'paraphrase_ability']
-                    },
-                    'grammatical_range_and_accuracy': {
-                        'band_9': 'Uses wide range of structures with full flexibility and accuracy.',
-                        'band_8': 'Uses wide range of structures flexibly with majority error-free.',
-                        'band_7': 'Uses range of complex structures with some flexibility.',
-                        'band_6': 'Uses mix of simple and complex structures with some errors.',
-                        'band_5': 'Uses basic sentence forms with reasonable accuracy.',
-                        'band_4': 'Uses only basic sentence forms with frequent errors.',
-                        'descriptors': ['complexity', 'range', 'accuracy', 'error_frequency', 'communication_impact']
-                    },
-                    'pronunciation': {
-                        'band_9': 'Uses wide range of pronunciation features with precise control.',
-                        'band_8': 'Uses wide range of pronunciation features flexibly.',
-                        'band_7': 'Shows all positive features and sustained ability.',
-                        'band_6': 'Uses range of pronunciation features with mixed control.',
-                        'band_5': 'Shows some effective use of features but not sustained.',
-                        'band_4': 'Limited range of pronunciation features.',
-                        'descriptors': ['individual_sounds', 'word_stress', 'sentence_stress', 'intonation', 'chunking']
-                    }
-                },
-                'nova_sonic_prompts': {
-                    'system_prompt': 'You are Maya, an experienced IELTS examiner conducting a speaking assessment. Follow IELTS speaking test format with Part 1 (familiar topics), Part 2 (long turn), and Part 3 (abstract discussion). Evaluate based on fluency, vocabulary, grammar, and pronunciation.',
-                    'part_1_topics': ['work', 'studies', 'hometown', 'family', 'hobbies', 'food', 'transport', 'weather'],
-                    'part_2_structure': 'Give candidate cue card with topic, 1 minute preparation, 2 minutes speaking',
-                    'part_3_approach': 'Ask abstract questions related to Part 2 topic, probe deeper understanding'
-                }
-            },
-            'general_speaking': {
-                'rubric_id': 'ielts_general_speaking_v2024',
-                'assessment_type': 'speaking',
-                'criteria': {
-                    # Same criteria as academic but with different topics and contexts
-                    'fluency_and_coherence': {
-                        'band_9': 'Speaks fluently with only rare repetition or self-correction. Develops topics coherently and appropriately.',
-                        'band_8': 'Speaks fluently with only occasional repetition or self-correction. Develops topics coherently.',
-                        'band_7': 'Speaks at length without noticeable effort or loss of coherence. Uses linking words effectively.',
-                        'band_6': 'Speaks at length though may show hesitation. Generally coherent but may lack progression.',
-                        'band_5': 'Usually maintains flow but uses repetition and hesitation. Over-uses linking words.',
-                        'band_4': 'Cannot respond without noticeable pauses. Speech may be slow with frequent repetition.',
-                        'descriptors': ['flow', 'pace', 'coherence', 'topic_development', 'linking_devices']
-                    }
-                },
-                'nova_sonic_prompts': {
-                    'system_prompt': 'You are Maya, an IELTS examiner for General Training. Focus on everyday situations, practical English usage, and social contexts.',
-                    'part_1_topics': ['daily_routine', 'shopping', 'travel', 'entertainment', 'sports', 'technology'],
-                    'part_2_structure': 'Practical topics like describing experiences, places, people',
-                    'part_3_approach': 'Discuss practical implications and everyday applications'
-                }
-            }
-        }
-        
-        # IELTS Writing Assessment Rubrics (for Nova Micro)
-        writing_rubrics = {
-            'academic_writing': {
-                'rubric_id': 'ielts_academic_writing_v2024',
-                'assessment_type': 'writing',
-                'task_1': {
-                    'task_achievement': {
-                        'band_9': 'Fully satisfies all requirements. Clearly presents fully developed response.',
-                        'band_8': 'Covers requirements sufficiently. Clearly presents well-developed response.',
-                        'band_7': 'Covers requirements. Clearly presents key features/bullet points.',
-                        'band_6': 'Addresses requirements with some omissions. Format appropriate.',
-                        'band_5': 'Generally addresses requirements. Format may be inappropriate.',
-                        'band_4': 'Attempts to address requirements but fails to cover all.',
-                        'descriptors': ['completeness', 'appropriacy', 'accuracy', 'overview', 'key_features']
-                    }
-                },
-                'task_2': {
-                    'task_response': {
-                        'band_9': 'Fully addresses all parts. Develops clear, comprehensive arguments.',
-                        'band_8': 'Sufficiently addresses all parts. Develops relevant arguments.',
-                        'band_7': 'Addresses all parts though some more than others.',
-                        'band_6': 'Addresses all parts but some may be more developed.',
-                        'band_5': 'Addresses the task only partially. Limited development.',
-                        'band_4': 'Responds to task but in limited way.',
-                        'descriptors': ['position_clarity', 'argument_development', 'examples', 'conclusion']
-                    }
-                },
-                'nova_micro_prompts': {
-                    'system_prompt': 'You are an IELTS Academic Writing examiner. Evaluate Task Achievement/Response, Coherence and Cohesion, Lexical Resource, and Grammatical Range and Accuracy. Provide band scores (1-9) and detailed feedback.',
-                    'task_1_requirements': 'Describe visual information (graphs, charts, diagrams). Minimum 150 words. Academic tone.',
-                    'task_2_requirements': 'Present argument or discussion. Minimum 250 words. Academic essay structure.'
-                }
-            }
-        }
-        
-        # Store rubrics in database
-        for speaking_type, rubric in speaking_rubrics.items():
-            self.assessment_rubrics_table.put_item(rubric)
-            
-        for writing_type, rubric in writing_rubrics.items():
-            self.assessment_rubrics_table.put_item(rubric)
-            
-        print("[AWS_MOCK] IELTS assessment rubrics initialized")
-    
     def _create_test_user(self):
         """Create test user for development and testing"""
-        test_user_data = {
+        test_user_record = {
+            'user_id': str(_uuid4()),
             'email': 'test@ieltsgenaiprep.com',
-            'password': 'testpassword123'
+            'password_hash': TEST_USER_PASSWORD_HASH,
+            'created_at': now_iso(),
+            'purchases': [],
+            'last_login': None
         }
         
-        if self.create_user(test_user_data):
+        if self.users_table.put_item(test_user_record):
             # Add test purchases for all assessment types
             user = self.users_table.get_item('test@ieltsgenaiprep.com')
             if user:
                 test_purchases = [
-                    {'product_id': 'academic-writing', 'platform': 'mobile'},
-                    {'product_id': 'academic-speaking', 'platform': 'mobile'},
-                    {'product_id': 'general-writing', 'platform': 'mobile'},
-                    {'product_id': 'general-speaking', 'platform': 'mobile'}
+                    {'product_id': 'academic_writing_assessment', 'platform': 'mobile'},
+                    {'product_id': 'academic_speaking_assessment', 'platform': 'mobile'},
+                    {'product_id': 'general_writing_assessment', 'platform': 'mobile'},
+                    {'product_id': 'general_speaking_assessment', 'platform': 'mobile'}
                 ]
                 
                 for purchase in test_purchases:
-                    self.add_user_purchase(user['user_id'], purchase)
+                    self.add_user_purchase(user['email'], purchase)
                 
-                print("[AWS_MOCK] Test user created: test@ieltsgenaiprep.com / testpassword123")
+                logger.info("[AWS_MOCK] Test user created: test@ieltsgenaiprep.com / testpassword123")
     
     def create_user(self, user_data: Dict[str, Any]) -> bool:
         """Create new user with bcrypt password hashing"""
@@ -398,10 +786,10 @@ class AWSMockServices:
         password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
         
         user_record = {
-            'user_id': str(uuid.uuid4()),
+            'user_id': str(_uuid4()),
             'email': email,
             'password_hash': password_hash.decode('utf-8'),
-            'created_at': datetime.utcnow().isoformat(),
+            'created_at': now_iso(),
             'purchases': [],
             'last_login': None
         }
@@ -417,9 +805,11 @@ class AWSMockServices:
         
         # Verify password with bcrypt
         if bcrypt.checkpw(password.encode('utf-8'), user['password_hash'].encode('utf-8')):
-            # Update last login
-            user['last_login'] = datetime.utcnow().isoformat()
-            self.users_table.put_item(user)
+            # Update last login (targeted update rather than rewriting the record)
+            now = _utcnow()
+            last_login = user.get('last_login')
+            if not last_login or (now - datetime.fromisoformat(last_login)).total_seconds() >= self.LAST_LOGIN_WRITE_INTERVAL:
+                self.users_table.update_item(email, {'last_login': now.isoformat()})
             return user
         
         return None
@@ -427,18 +817,40 @@ class AWSMockServices:
     def create_session(self, session_data: Dict[str, Any]) -> bool:
         """Create session in ElastiCache"""
         session_id = session_data['session_id']
+        self._session_l1.pop(session_id, None)
+        user_email = session_data.get('user_email')
+        if user_email:
+            # Drop ids whose sessions have expired so the index tracks only live sessions
+            exists = self.session_cache.exists
+            live = {sid for sid in self.user_sessions.get(user_email, ()) if exists(sid)}
+            live.add(session_id)
+            self.user_sessions[user_email] = live
         return self.session_cache.set(session_id, session_data, ex=3600)
     
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get session from ElastiCache"""
-        return self.session_cache.get(session_id)
+        """Get session, serving recently fetched sessions from the in-process cache"""
+        now = time.time()
+        cached = self._session_l1.get(session_id)
+        if cached and now - cached[1] < self.SESSION_L1_TTL:
+            self._session_l1.move_to_end(session_id)
+            return cached[0]
+        
+        session = self.session_cache.get(session_id)
+        if session:
+            self._session_l1[session_id] = (session, now)
+            self._session_l1.move_to_end(session_id)
+            if len(self._session_l1) > self.SESSION_L1_MAX_ENTRIES:
+                self._session_l1.popitem(last=False)
+        else:
+            self._session_l1.pop(session_id, None)
+        return session
     
     def log_event(self, log_group: str, message: str, level: str = 'INFO'):
         """Log event to CloudWatch"""
-        self.cloudwatch.put_log_events(log_group, 'lambda-stream', [{
-            'timestamp': int(time.time() * 1000),
+        self.cloudwatch.queue_log_event(log_group, 'lambda-stream', {
+            'timestamp': time.time_ns() // 1_000_000,
             'message': f"[{level}] {message}"
-        }])
+        })
     
     def record_metric(self, metric_name: str, value: float, unit: str = 'Count'):
         """Record metric to CloudWatch"""
@@ -446,54 +858,57 @@ class AWSMockServices:
             'MetricName': metric_name,
             'Value': value,
             'Unit': unit,
-            'Timestamp': datetime.utcnow()
+            'Timestamp': _utcnow()
         }])
     
     def get_assessment_rubric(self, assessment_type: str) -> Optional[Dict[str, Any]]:
-        """Get IELTS assessment rubric from DynamoDB for Nova Sonic/Micro"""
-        return self.assessment_rubrics_table.get_item(assessment_type)
+        """Get IELTS assessment rubric for Nova Sonic/Micro"""
+        return _RUBRICS.get(assessment_type)
     
     def store_assessment_result(self, result_data: Dict[str, Any]) -> bool:
         """Store assessment result in DynamoDB"""
         return self.assessment_results_table.put_item(result_data)
     
-    def get_user_assessments(self, user_email: str) -> Dict[str, Dict[str, Any]]:
-        """Get user's purchased assessments with attempt counts"""
+    def get_user_assessments(self, user_email: str) -> Mapping[str, Mapping[str, Any]]:
+        """Get user's purchased assessments with attempt counts (read-only defaults for unknown users)"""
         user = self.users_table.get_item(user_email)
         if not user or 'purchases' not in user:
             # Return default assessments for testing
-            return {
-                'academic_writing': {'attempts_left': 4, 'total_attempts': 4},
-                'general_writing': {'attempts_left': 4, 'total_attempts': 4},
-                'academic_speaking': {'attempts_left': 4, 'total_attempts': 4},
-                'general_speaking': {'attempts_left': 4, 'total_attempts': 4}
-            }
+            return _DEFAULT_ASSESSMENTS
         
+        # Attempts add up across repeat purchases of the same type
         assessment_data = {}
         for purchase in user['purchases']:
-            assessment_type = purchase.get('assessment_type')
-            if assessment_type:
-                assessment_data[assessment_type] = {
-                    'attempts_left': purchase.get('assessments_remaining', 4),
+            entry = assessment_data.get(purchase.assessment_type)
+            if entry is None:
+                assessment_data[purchase.assessment_type] = {
+                    'attempts_left': purchase.assessments_remaining,
                     'total_attempts': 4,
-                    'purchase_date': purchase.get('purchase_date', ''),
-                    'last_used': purchase.get('last_used', ''),
-                    'price': purchase.get('price', 49.99)
+                    'purchase_date': purchase.purchase_date,
+                    'last_used': purchase.last_used,
+                    'price': purchase.price
                 }
+            else:
+                entry['attempts_left'] += purchase.assessments_remaining
+                entry['total_attempts'] += 4
+                entry['purchase_date'] = purchase.purchase_date
+                entry['last_used'] = max(entry['last_used'], purchase.last_used)
+                entry['price'] = purchase.price
         
         return assessment_data
     
     def get_assessment_history(self, user_email: str) -> list:
         """Get assessment history for a user from DynamoDB"""
-        results = self.assessment_results_table.scan(f"user_email = '{user_email}'")
+        results = self.assessment_results_table.query_gsi('user_email', user_email)
         
         if not results:
             # Return mock assessment history for testing
+            now = _utcnow()
             return [
                 {
                     'assessment_id': f'test_assessment_{int(time.time())}',
                     'assessment_type': 'academic-writing',
-                    'timestamp': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+                    'timestamp': now.strftime('%Y-%m-%d %H:%M:%S'),
                     'overall_band': 7.5,
                     'completed': True,
                     'user_email': user_email
@@ -501,7 +916,7 @@ class AWSMockServices:
                 {
                     'assessment_id': f'test_assessment_{int(time.time())-3600}',
                     'assessment_type': 'general-speaking',
-                    'timestamp': (datetime.utcnow() - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S'),
+                    'timestamp': (now - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S'),
                     'overall_band': 8.0,
                     'completed': True,
                     'user_email': user_email
@@ -515,10 +930,11 @@ class AWSMockServices:
         user = self.users_table.get_item(user_email)
         if not user:
             # Return basic profile for testing
+            timestamp = _utcnow().strftime('%Y-%m-%d %H:%M:%S')
             return {
                 'email': user_email,
-                'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
-                'last_login': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+                'created_at': timestamp,
+                'last_login': timestamp,
                 'total_attempts': 0,
                 'completed_assessments': 0,
                 'account_status': 'active'
@@ -530,8 +946,8 @@ class AWSMockServices:
         
         if 'purchases' in user:
             for purchase in user['purchases']:
-                total_attempts += purchase.get('assessments_used', 0)
-                if purchase.get('assessments_used', 0) > 0:
+                total_attempts += purchase.assessments_used
+                if purchase.assessments_used > 0:
                     completed_assessments += 1
         
         return {
@@ -547,41 +963,42 @@ class AWSMockServices:
     def delete_user_completely(self, user_email: str) -> bool:
         """Delete all user data across all tables (GDPR compliance)"""
         try:
-            # Delete from users table
+            # Delete from users table, recycling its purchase records
+            user = self.users_table.get_item(user_email)
             self.users_table.delete_item(user_email)
+            if user:
+                self._release_purchases(user.get('purchases', ()))
+            self._counts_cache.pop(user_email, None)
             
             # Delete from assessment results table
-            user_assessments = self.assessment_results_table.scan(f"user_email = '{user_email}'")
-            for assessment in user_assessments:
+            results_table = self.assessment_results_table
+            for assessment in results_table.query_gsi('user_email', user_email):
                 assessment_id = assessment.get('assessment_id')
                 if assessment_id:
-                    self.assessment_results_table.delete_item(assessment_id)
-            
-            # Delete from auth tokens table
-            tokens = self.auth_tokens_table.scan(f"user_email = '{user_email}'")
-            for token in tokens:
-                token_id = token.get('token_id')
-                if token_id:
-                    self.auth_tokens_table.delete_item(token_id)
+                    results_table.delete_item(assessment_id)
             
             # Delete from GDPR tables
-            self.gdpr_consent_table.delete_item(user_email)
-            self.gdpr_requests_table.delete_item(user_email)
-            
-            # Clear from session cache
-            sessions_to_delete = []
-            for session_id, session_data in self.session_cache.items():
-                if session_data.get('user_email') == user_email:
-                    sessions_to_delete.append(session_id)
+            self.gdpr_consents_table.delete_item(user_email)
+            self.gdpr_cookie_preferences_table.delete_item(user_email)
+            delete_request = self.gdpr_data_requests_table.delete_item
+            delete_export = self._export_blobs.delete
+            for request in self.get_user_gdpr_requests(user_email):
+                request_id = request.get('request_id')
+                delete_request(request_id)
+                delete_export(request_id)
             
-            for session_id in sessions_to_delete:
-                del self.session_cache[session_id]
+            # Clear the user's sessions from the session cache
+            delete_session = self.session_cache.delete
+            session_l1 = self._session_l1
+            for session_id in self.user_sessions.pop(user_email, ()):
+                delete_session(session_id)
+                session_l1.pop(session_id, None)
             
-            print(f"[GDPR_DELETION] All data deleted for user: {user_email}")
+            logger.info("[GDPR_DELETION] All data deleted for user: %s", user_email)
             return True
             
         except Exception as e:
-            print(f"[ERROR] Failed to delete user data: {str(e)}")
+            logger.error("[ERROR] Failed to delete user data: %s", e)
             return False
     
     def add_user_purchase(self, user_id: str, purchase_data: Dict[str, Any]) -> bool:
@@ -590,36 +1007,38 @@ class AWSMockServices:
         if not user:
             return False
         
-        # Map product IDs to assessment types
-        product_assessment_map = {
-            'com.ieltsgenaiprep.academic.writing': 'academic_writing',
-            'com.ieltsgenaiprep.general.writing': 'general_writing',
-            'com.ieltsgenaiprep.academic.speaking': 'academic_speaking',
-            'com.ieltsgenaiprep.general.speaking': 'general_speaking',
-            'academic_writing_assessment': 'academic_writing',
-            'general_writing_assessment': 'general_writing',
-            'academic_speaking_assessment': 'academic_speaking',
-            'general_speaking_assessment': 'general_speaking'
-        }
-        
-        assessment_type = product_assessment_map.get(purchase_data.get('product_id'))
+        assessment_type = _PRODUCT_ASSESSMENT_MAP.get(purchase_data.get('product_id'))
         if not assessment_type:
             return False
         
-        purchase_record = {
-            'product_id': purchase_data.get('product_id'),
-            'assessment_type': assessment_type,
-            'purchase_date': datetime.utcnow().isoformat(),
-            'platform': purchase_data.get('platform', 'mobile'),
-            'receipt_data': purchase_data.get('receipt_data'),
-            'assessments_remaining': 4,
-            'assessments_used': 0,
-            'price': 49.99,
-            'currency': 'USD'
-        }
-        
-        user['purchases'].append(purchase_record)
-        return self.users_table.put_item(user)
+        # Pooled records were reset to defaults when released
+        purchase_record = self._purchase_pool.pop() if self._purchase_pool else Purchase()
+        purchase_record.product_id = purchase_data.get('product_id')
+        purchase_record.assessment_type = assessment_type
+        purchase_record.purchase_date = now_iso()
+        purchase_record.platform = purchase_data.get('platform', 'mobile')
+        purchase_record.receipt_data = purchase_data.get('receipt_data')
+        
+        # Index every purchase per assessment type, oldest first, so lookups
+        # touch only that type's purchases
+        purchases_by_type = user.get('purchases_by_type', {})
+        purchases_by_type.setdefault(assessment_type, []).append(len(user['purchases']))
+        
+        # Append in place rather than rewriting the whole user record
+        return self.users_table.update_item(user_id, {
+            'purchases_by_type': purchases_by_type,
+            '_purchases_version': next(self._purchase_versions)
+        }, list_appends={'purchases': [purchase_record]})
+    
+    def _release_purchases(self, purchases):
+        """Return purchase records of a deleted user to the bounded pool"""
+        pool = self._purchase_pool
+        for purchase_record in purchases:
+            if len(pool) >= self.PURCHASE_POOL_MAX:
+                break
+            # Reset to defaults so no purchase details outlive the user
+            purchase_record.reset()
+            pool.append(purchase_record)
 
     def use_assessment_attempt(self, user_email: str, assessment_type: str) -> bool:
         """Decrement assessment counter when user completes an assessment"""
@@ -627,641 +1046,150 @@ class AWSMockServices:
         if not user or 'purchases' not in user:
             return False
         
-        # Find the purchase for this assessment type
-        for purchase in user['purchases']:
-            if purchase.get('assessment_type') == assessment_type:
-                if purchase.get('assessments_remaining', 0) > 0:
-                    purchase['assessments_remaining'] -= 1
-                    purchase['assessments_used'] = purchase.get('assessments_used', 0) + 1
-                    purchase['last_used'] = datetime.utcnow().isoformat()
-                    
-                    # Update user record
-                    self.users_table.put_item(user)
-                    
-                    self.log_event('AssessmentUsage', f'Assessment used: {user_email} - {assessment_type}, {purchase["assessments_remaining"]} remaining')
-                    return True
+        # Draw from the oldest purchase of this type with attempts left
+        purchases = user['purchases']
+        for index in user.get('purchases_by_type', {}).get(assessment_type, ()):
+            purchase = purchases[index]
+            if purchase.assessments_remaining > 0:
+                break
+        else:
+            return False
         
-        return False
+        purchase.assessments_remaining -= 1
+        purchase.assessments_used += 1
+        purchase.last_used = now_iso()
+        
+        # Update only the purchases attribute of the user record
+        self.users_table.update_item(user_email, {
+            'purchases': purchases,
+            '_purchases_version': next(self._purchase_versions)
+        })
+        
+        self.log_event('AssessmentUsage', f'Assessment used: {user_email} - {assessment_type}, {purchase.assessments_remaining} remaining')
+        return True
 
-    def get_user_assessment_counts(self, user_email: str) -> Dict[str, Dict[str, int]]:
-        """Get remaining and used assessment counts for user"""
+    def get_user_assessment_counts(self, user_email: str) -> Mapping[str, Mapping[str, Any]]:
+        """Get remaining and used assessment counts for user (read-only, cached until purchases change)"""
         user = self.users_table.get_item(user_email)
         if not user or 'purchases' not in user:
-            return {}
+            return MappingProxyType({})
         
-        assessment_counts = {}
-        for purchase in user['purchases']:
-            assessment_type = purchase.get('assessment_type')
-            if assessment_type:
-                assessment_counts[assessment_type] = {
-                    'remaining': purchase.get('assessments_remaining', 0),
-                    'used': purchase.get('assessments_used', 0),
-                    'total': 4,
-                    'purchased_at': purchase.get('purchase_date', ''),
-                    'last_used': purchase.get('last_used', ''),
-                    'price': purchase.get('price', 49.99)
-                }
+        version = user.get('_purchases_version')
+        cached = self._counts_cache.get(user_email)
+        if cached is not None and cached[0] == version:
+            self._counts_cache.move_to_end(user_email)
+            return cached[1]
         
-        return assessment_counts
+        purchases = user['purchases']
+        assessment_counts = {}
+        for assessment_type, indexes in user.get('purchases_by_type', {}).items():
+            type_purchases = [purchases[index] for index in indexes]
+            newest = type_purchases[-1]
+            assessment_counts[assessment_type] = MappingProxyType({
+                'remaining': sum(p.assessments_remaining for p in type_purchases),
+                'used': sum(p.assessments_used for p in type_purchases),
+                'total': 4 * len(type_purchases),
+                'purchased_at': newest.purchase_date,
+                'last_used': max(p.last_used for p in type_purchases),
+                'price': newest.price
+            })
+        counts = MappingProxyType(assessment_counts)
+        # Overwrites any stale-version entry; evicts least recently read users past the cap
+        self._counts_cache[user_email] = (version, counts)
+        self._counts_cache.move_to_end(user_email)
+        if len(self._counts_cache) > self.COUNTS_CACHE_MAX_ENTRIES:
+            self._counts_cache.popitem(last=False)
+        return counts
 
     def has_assessment_access(self, user_email: str, assessment_type: str) -> bool:
         """Check if user has remaining assessments for this type"""
-        counts = self.get_user_assessment_counts(user_email)
-        return counts.get(assessment_type, {}).get('remaining', 0) > 0
+        return self._remaining_for(user_email, assessment_type) > 0
 
-    def get_unique_assessment_question(self, user_email: str, assessment_type: str) -> Optional[Dict[str, Any]]:
+    def _remaining_for(self, user_email: str, assessment_type: str) -> int:
+        """Remaining attempts for one assessment type, summed over its indexed purchases"""
+        user = self.users_table.get_item(user_email)
+        if not user or 'purchases' not in user:
+            return 0
+        
+        purchases = user['purchases']
+        return sum(
+            purchases[index].assessments_remaining
+            for index in user.get('purchases_by_type', {}).get(assessment_type, ())
+        )
+
+    def get_unique_assessment_question(self, user_email: str, assessment_type: str) -> Optional[Mapping[str, Any]]:
         """Get a unique assessment question that user hasn't seen before"""
         user = self.users_table.get_item(user_email)
         if not user:
             return None
         
         # Get user's completed assessments to avoid repetition
-        completed_assessments = user.get('completed_assessments', [])
-        used_questions = [a.get('question_id') for a in completed_assessments if a.get('assessment_type') == assessment_type]
+        completed_assessments = user.get('completed_assessments', ())
+        used_questions = {
+            a.question_id for a in completed_assessments
+            if a.assessment_type == assessment_type
+        }
+        
+        # Get question ids for this assessment type
+        _, ids_by_type, questions_by_id = _load_question_banks()
+        question_ids = ids_by_type.get(assessment_type)
+        if not question_ids:
+            return None
         
-        # Get question bank for this assessment type
-        question_bank = self._get_question_bank(assessment_type)
-        available_questions = [q for q in question_bank if q['question_id'] not in used_questions]
+        # Draw until an unused question turns up; with few questions used
+        # this succeeds within a draw or two and builds no candidate list
+        choice = _rng.choice
+        for _ in range(len(question_ids)):
+            question_id = choice(question_ids)
+            if question_id not in used_questions:
+                return questions_by_id[question_id]
         
-        if not available_questions:
-            # If all questions used, allow reuse after completing all 4 attempts
-            available_questions = question_bank
+        # If all questions used, allow reuse after completing all 4 attempts
+        available_ids = [q for q in question_ids if q not in used_questions] or question_ids
         
         # Return random question from available pool
-        return random.choice(available_questions) if available_questions else None
+        return questions_by_id[choice(available_ids)]
 
-    def _get_question_bank(self, assessment_type: str) -> List[Dict[str, Any]]:
-        """Get comprehensive question bank for assessment type - Full Migration Complete"""
-        question_banks = {
-            'academic_writing': [
-                {
-                    'question_id': 'aw_task2_001',
-                    'task': 'Task 2',
-                    'prompt': 'Some people believe that universities should require every student to take a variety of courses outside their field of study. Others believe that universities should not force students to take any courses other than those that will help prepare them for jobs in their chosen fields. Write a response in which you discuss which view more closely aligns with your own position and explain your reasoning for the position you take.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_002', 
-                    'task': 'Task 2',
-                    'prompt': 'Many governments think that economic progress is their most important goal. Some people, however, think that other types of progress are equally important for a country. Discuss both these views and give your own opinion.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_003',
-                    'task': 'Task 2', 
-                    'prompt': 'In some countries, young people are encouraged to work or travel for a year between finishing high school and starting university studies. Discuss the advantages and disadvantages for young people who decide to do this.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_004',
-                    'task': 'Task 2',
-                    'prompt': 'Some people say that the main environmental problem of our time is the loss of particular species of plants and animals. Others say that there are more important environmental problems. Discuss both these views and give your own opinion.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_005',
-                    'task': 'Task 2',
-                    'prompt': 'In a number of countries, some people think it is necessary to spend large sums of money on constructing new railway lines for very fast trains between cities. Others believe the money should be spent on improving existing public transport. Discuss both these views and give your own opinion.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                # Additional comprehensive questions from Academic Writing database
-                {
-                    'question_id': 'aw_task2_006',
-                    'task': 'Task 2',
-                    'prompt': 'The global economy is evolving quickly, and individuals can no longer rely on the same career path or workplace environment throughout their lives. Discuss the potential reasons for this rapid evolution, and propose strategies to prepare people for their careers in the future.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_007',
-                    'task': 'Task 2',
-                    'prompt': 'Many countries are experiencing a significant increase in the proportion of older people in their populations. Discuss the possible reasons for this demographic shift, and suggest ways in which societies can adapt to this aging population.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_008',
-                    'task': 'Task 2',
-                    'prompt': 'In many parts of the world, the popularity of private vehicles is increasing despite growing concerns about environmental pollution and traffic congestion. Discuss the possible reasons for the continued preference for private vehicles, and suggest ways in which governments could encourage people to use alternative forms of transport.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_009',
-                    'task': 'Task 2',
-                    'prompt': 'The increasing availability and influence of social media have fundamentally changed the way people communicate and form relationships. Discuss the potential benefits and drawbacks of this development, and suggest ways individuals and societies can navigate the impact of social media in the future.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_010',
-                    'task': 'Task 2',
-                    'prompt': 'Many cities around the world are experiencing increasing pressure from tourism, which can have both positive and negative effects on local communities and environments. Discuss the potential benefits and drawbacks of mass tourism in urban areas, and suggest ways in which cities can manage tourism more sustainably in the future.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_011',
-                    'task': 'Task 2',
-                    'prompt': 'The reliance on standardized testing as the primary method for evaluating student performance and determining educational opportunities is a subject of ongoing debate. Discuss the potential advantages and disadvantages of standardized testing in education, and suggest alternative methods that could be used to assess student learning and potential.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'aw_task2_012',
-                    'task': 'Task 2',
-                    'prompt': 'The increasing consumption of fast food and processed meals is a growing trend in many developed nations. Discuss the possible reasons for the popularity of these types of food, and suggest ways in which individuals and governments could encourage healthier eating habits.',
-                    'word_limit': 250,
-                    'time_limit': 40
-                }
-            ],
-            'general_writing': [
-                {
-                    'question_id': 'gw_task1_001',
-                    'task': 'Task 1',
-                    'prompt': 'You recently bought a piece of equipment for your kitchen but it did not work. You phoned the shop but no action was taken. Write a letter to the shop manager. In your letter: describe the problem with the equipment, explain what happened when you phoned the shop, say what you would like the manager to do.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                },
-                {
-                    'question_id': 'gw_task1_002',
-                    'task': 'Task 1', 
-                    'prompt': 'You work for an international company, and would like to spend six months working in its head office in another country. Write a letter to your manager. In your letter: explain why you want to work in the company\'s head office for six months, say how your work could be done while you are away, ask for his/her help in arranging it.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                },
-                {
-                    'question_id': 'gw_task1_003',
-                    'task': 'Task 1',
-                    'prompt': 'A friend has agreed to look after your house and pet while you are on holiday. Write a letter to your friend. In your letter: give contact details for when you are away, give instructions about how to care for your pet, describe other household duties.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                },
-                {
-                    'question_id': 'gw_task1_004',
-                    'task': 'Task 1',
-                    'prompt': 'You have seen an advertisement in an Australian magazine for someone to live with a family for six months and look after their six-year-old child. Write a letter to the parents. In your letter: explain why you would like the job, give details of why you would be a suitable person to employ, say how you would spend your free time while you are in Australia.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                },
-                {
-                    'question_id': 'gw_task1_005',
-                    'task': 'Task 1',
-                    'prompt': 'You are going to another country to study. You would like to do a part-time job while you are studying, so you want to ask a friend who lives there for some help. Write a letter to your friend. In your letter: give details about your study plans, explain why you want to get a part-time job, suggest how your friend could help you find a job.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                },
-                # Additional comprehensive questions from General Writing database - Task 2 Essays
-                {
-                    'question_id': 'gw_task2_006',
-                    'task': 'Task 2',
-                    'prompt': 'Urban areas face increasing traffic problems. Some think building more roads is the answer, while others favor improving public transport. Who do you believe should be the priority: expanding roads or developing public transport?',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'gw_task2_007',
-                    'task': 'Task 2',
-                    'prompt': 'Many companies are now allowing their employees to work from home some or all of the time. This shift has both benefits and drawbacks. Do you think the advantages of remote work outweigh the disadvantages, or vice versa?',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'gw_task2_008',
-                    'task': 'Task 2',
-                    'prompt': 'The use of social media has become widespread among young people. It offers opportunities for connection but also presents potential risks. Do you believe the benefits of social media for young people outweigh the risks, or are the risks more significant?',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                {
-                    'question_id': 'gw_task2_009',
-                    'task': 'Task 2',
-                    'prompt': 'Fast food is a popular choice for many due to its convenience and affordability. However, its impact on health is often debated. Do you think the advantages of fast food outweigh its disadvantages, or are the health concerns more significant?',
-                    'word_limit': 250,
-                    'time_limit': 40
-                },
-                # Additional Task 1 Letters from database files
-                {
-                    'question_id': 'gw_task1_006',
-                    'task': 'Task 1',
-                    'prompt': 'You are currently enrolled in an evening course at a local community center, but you are facing several issues with the classroom environment that make it challenging to focus and learn effectively. Write a letter to the course coordinator at the community center. In your letter: describe the situation, explain your problems and why it is difficult to learn, suggest what kind of classroom environment you would prefer.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                },
-                {
-                    'question_id': 'gw_task1_007',
-                    'task': 'Task 1',
-                    'prompt': 'You have recently joined a local gym to improve your fitness, but you are experiencing several issues with the gym facilities that make it difficult to exercise comfortably. Write a letter to the gym manager. In your letter: describe the situation, explain your problems and why it is difficult to exercise, suggest what kind of improvements or facilities you would prefer.',
-                    'word_limit': 150,
-                    'time_limit': 20
-                }
-            ],
-            'academic_speaking': [
-                {
-                    'question_id': 'as_complete_001',
-                    'assessment_type': 'academic_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'Tell me about your favorite hobby and why you enjoy it.',
-                                'Tell me about your job. What responsibilities do you have?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a place you have visited that had a significant impact on you. You should say: where the place is, when you went there, what you did there, and explain why this place had such an impact on you.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'Do you think travel is an important part of education? Why or why not?',
-                                'What changes do you think will happen in education in the future?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'as_complete_002',
-                    'assessment_type': 'academic_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'What do you like or dislike about your studies?',
-                                'Would you prefer to work in a large company or a small company? Why?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a person who has had a significant influence on your life. You should say: who this person is, how you know them, what they do, and explain why they have influenced you so much.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'Do you think students should be able to choose what they study at school?',
-                                'How important do you think it is for people to continue learning throughout their lives?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'as_complete_003',
-                    'assessment_type': 'academic_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'Can you describe the place where you live?',
-                                'What kind of accommodation do you live in?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a teacher who has influenced you. You should say: when you met them, what subject they taught, what was special about them, and explain how they influenced your life.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'What factors should people consider when choosing a career?',
-                                'Do you think it\'s better to have one job for life or to change jobs regularly?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'as_complete_004',
-                    'assessment_type': 'academic_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'What changes would you like to make to your home?',
-                                'Describe your hometown. What is it known for?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a friend who is a good leader. You should say: who the person is, how you know this person, what leadership qualities they have, and explain why you think they are a good leader.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'How has technology changed the way people work in your country?',
-                                'What environmental problems does your country face today?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'as_complete_005',
-                    'assessment_type': 'academic_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'Is your hometown a good place for tourists to visit? Why or why not?',
-                                'How has your hometown changed in recent years?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a public place you like to visit. You should say: where it is, when you usually go there, what you do there, and explain why you like this place.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'Do you think individuals or governments should be responsible for protecting the environment?',
-                                'How can we encourage more people to use public transportation instead of cars?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                }
-            ],
-            'general_speaking': [
-                {
-                    'question_id': 'gs_complete_001',
-                    'assessment_type': 'general_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'What activities do you enjoy doing in your free time?',
-                                'Do you prefer indoor or outdoor activities? Why?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a historic building you have visited. You should say: where it is, when you visited it, what the building looks like, and explain why you visited this building.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'How might technology change the way we live in the future?',
-                                'Do social media platforms bring people together or push them further apart?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'gs_complete_002',
-                    'assessment_type': 'general_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'How important is it to have hobbies?',
-                                'How often do you use computers or technology in your daily life?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a place in your country that you would recommend someone visit. You should say: where it is, what people can do there, when is the best time to visit, and explain why you would recommend this place.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'Should there be more regulation of technology and the internet?',
-                                'How has family life changed in your country in recent decades?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'gs_complete_003',
-                    'assessment_type': 'general_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'What impact does technology have on your work or studies?',
-                                'Do you think people rely too much on technology nowadays?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe an important object in your life. You should say: what it is, how long you\'ve had it, where you got it from, and explain why it\'s important to you.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'What role should governments play in healthcare and social services?',
-                                'Is it better to live in a city or in the countryside? Why?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'gs_complete_004',
-                    'assessment_type': 'general_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'What kind of places do you like to visit on vacation?',
-                                'Do you prefer traveling alone or with other people? Why?'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a piece of technology that you find useful. You should say: what it is, what you use it for, how often you use it, and explain why it is so useful to you.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'How can countries work together more effectively to solve global problems?',
-                                'What do you think are the biggest challenges facing young people today?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                },
-                {
-                    'question_id': 'gs_complete_005',
-                    'assessment_type': 'general_speaking',
-                    'parts': [
-                        {
-                            'part': 1,
-                            'duration': '4-5 minutes',
-                            'topic': 'Introduction and Interview',
-                            'questions': [
-                                'What\'s the most interesting journey you\'ve ever taken?',
-                                'Tell me about your favorite hobby and why you enjoy it.'
-                            ]
-                        },
-                        {
-                            'part': 2,
-                            'duration': '3-4 minutes',
-                            'topic': 'Individual Long Turn',
-                            'prompt': 'Describe a book that has influenced you. You should say: what kind of book it is, what it is about, when you first read it, and explain how it has influenced you.',
-                            'prep_time': 60,
-                            'talk_time': 120
-                        },
-                        {
-                            'part': 3,
-                            'duration': '4-5 minutes',
-                            'topic': 'Two-way Discussion',
-                            'questions': [
-                                'Do you think international tourism is mostly positive or negative for local communities?',
-                                'How might technology change the way we live in the future?'
-                            ]
-                        }
-                    ],
-                    'total_duration': '11-14 minutes'
-                }
-            ]
-        }
-        
-        bank = question_banks.get(assessment_type, [])
-        print(f"[COMPREHENSIVE] Loaded {len(bank)} questions for {assessment_type} - Full Migration Complete")
-        return bank
+    def _get_question_bank(self, assessment_type: str) -> Tuple[Mapping[str, Any], ...]:
+        """Get comprehensive question bank for assessment type"""
+        return _load_question_banks()[0].get(assessment_type, ())
 
     def mark_question_as_used(self, user_email: str, assessment_type: str, question_id: str) -> bool:
         """Mark question as used by user to prevent repetition"""
-        user = self.users_table.get_item(user_email)
-        if not user:
-            return False
-        
-        if 'completed_assessments' not in user:
-            user['completed_assessments'] = []
-        
-        # Add this assessment to completed list
-        assessment_record = {
-            'question_id': question_id,
-            'assessment_type': assessment_type,
-            'completed_at': datetime.utcnow().isoformat()
-        }
-        
-        user['completed_assessments'].append(assessment_record)
-        return self.users_table.put_item(user)
+        return self.record_and_mark(user_email, assessment_type, question_id)
 
     def record_completed_assessment(self, user_email: str, assessment_type: str, question_id: str, result_data: Dict[str, Any]) -> bool:
         """Record completed assessment and use attempt"""
-        user = self.users_table.get_item(user_email)
-        if not user:
-            return False
-        
-        # Add to completed assessments
-        if 'completed_assessments' not in user:
-            user['completed_assessments'] = []
-        
-        completed_assessment = {
-            'assessment_type': assessment_type,
-            'question_id': question_id,
-            'completed_at': datetime.utcnow().isoformat(),
-            'result_data': result_data
-        }
-        
-        user['completed_assessments'].append(completed_assessment)
+        return self.record_and_mark(user_email, assessment_type, question_id, result_data)
+
+    def record_and_mark(self, user_email: str, assessment_type: str, question_id: str,
+                        result_data: Optional[Dict[str, Any]] = None) -> bool:
+        """Record a completed assessment, marking its question as used, in one write"""
+        completed_assessment = CompletedAssessment(assessment_type, question_id, now_iso(), result_data)
         
-        # Update user record
-        return self.users_table.put_item(user)
+        # Append to the user's completed assessments in place; fails for unknown users
+        return self.users_table.update_item(user_email, list_appends={'completed_assessments': [completed_assessment]})
     
     def get_nova_sonic_prompts(self, assessment_type: str) -> Optional[Dict[str, Any]]:
         """Get Nova Sonic system prompts from DynamoDB rubrics"""
-        rubric = self.get_assessment_rubric(assessment_type)
-        return rubric.get('nova_sonic_prompts') if rubric else None
+        return _NOVA_SONIC_PROMPTS.get(assessment_type)
     
     def get_nova_micro_prompts(self, assessment_type: str) -> Optional[Dict[str, Any]]:
         """Get Nova Micro system prompts from DynamoDB rubrics"""
-        rubric = self.get_assessment_rubric(assessment_type)
-        return rubric.get('nova_micro_prompts') if rubric else None
+        return _NOVA_MICRO_PROMPTS.get(assessment_type)
 
     def get_health_status(self) -> Dict[str, Any]:
         """Get overall system health"""
+        # Count log groups that only have queued events so far
+        self.cloudwatch.flush_logs()
         return {
             'dynamodb_tables': {
-                'users': len(self.users_table.items),
-                'assessment_results': len(self.assessment_results_table.items),
-                'assessment_rubrics': len(self.assessment_rubrics_table.items),
-                'gdpr_consents': len(self.gdpr_consents_table.items),
-                'gdpr_data_requests': len(self.gdpr_data_requests_table.items),
-                'cookie_preferences': len(self.gdpr_cookie_preferences_table.items)
+                'users': self.users_table.item_count,
+                'assessment_results': self.assessment_results_table.item_count,
+                'assessment_rubrics': self.assessment_rubrics_table.item_count,
+                'gdpr_consents': self.gdpr_consents_table.item_count,
+                'gdpr_data_requests': self.gdpr_data_requests_table.item_count,
+                'cookie_preferences': self.gdpr_cookie_preferences_table.item_count
             },
             'elasticache': {
                 'active_sessions': len(self.session_cache.cache)
@@ -1281,15 +1209,7 @@ class AWSMockServices:
         consent_data = self.gdpr_consents_table.get_item(user_email)
         if not consent_data:
             # Default consent settings for new users
-            return {
-                'user_email': user_email,
-                'data_processing': True,  # Required for service
-                'audio_processing': True,
-                'marketing_emails': False,
-                'analytics': False,
-                'third_party_sharing': False,
-                'last_updated': datetime.utcnow().isoformat()
-            }
+            return {'user_email': user_email, **_DEFAULT_CONSENT, 'last_updated': now_iso()}
         return consent_data
     
     def update_user_consent(self, user_email: str, consent_data: Dict[str, Any]) -> bool:
@@ -1301,7 +1221,7 @@ class AWSMockServices:
             'marketing_emails': consent_data.get('marketing_emails', False),
             'analytics': consent_data.get('analytics', False),
             'third_party_sharing': consent_data.get('third_party_sharing', False),
-            'last_updated': datetime.utcnow().isoformat(),
+            'last_updated': now_iso(),
             'ip_address': consent_data.get('ip_address', ''),
             'user_agent': consent_data.get('user_agent', '')
         }
@@ -1315,14 +1235,7 @@ class AWSMockServices:
         """Get user's cookie preferences"""
         cookie_prefs = self.gdpr_cookie_preferences_table.get_item(user_email)
         if not cookie_prefs:
-            return {
-                'user_email': user_email,
-                'necessary': True,  # Always required
-                'functional': True,
-                'analytics': False,
-                'marketing': False,
-                'last_updated': datetime.utcnow().isoformat()
-            }
+            return {'user_email': user_email, **_DEFAULT_COOKIE_PREFERENCES, 'last_updated': now_iso()}
         return cookie_prefs
     
     def update_cookie_preferences(self, user_email: str, preferences: Dict[str, Any]) -> bool:
@@ -1333,7 +1246,7 @@ class AWSMockServices:
             'functional': preferences.get('functional', True),
             'analytics': preferences.get('analytics', False),
             'marketing': preferences.get('marketing', False),
-            'last_updated': datetime.utcnow().isoformat()
+            'last_updated': now_iso()
         }
         
         result = self.gdpr_cookie_preferences_table.put_item(cookie_record)
@@ -1343,7 +1256,8 @@ class AWSMockServices:
     
     def request_data_export(self, user_email: str, export_format: str = 'json', include_assessments: bool = True) -> str:
         """Create data export request and return request ID"""
-        request_id = str(uuid.uuid4())
+        request_id = _uuid4().hex
+        timestamp = now_iso()
         
         # Get user data
         user_data = self.users_table.get_item(user_email)
@@ -1364,15 +1278,15 @@ class AWSMockServices:
                 'email': user_data.get('email'),
                 'created_at': user_data.get('created_at'),
                 'last_login': user_data.get('last_login'),
-                'purchases': user_data.get('purchases', [])
+                'purchases': [purchase.to_dict() for purchase in user_data.get('purchases', ())]
             },
             'assessments': assessment_data,
             'consent_history': consent_data,
             'export_info': {
                 'request_id': request_id,
                 'format': export_format,
-                'created_at': datetime.utcnow().isoformat(),
-                'data_as_of': datetime.utcnow().isoformat()
+                'created_at': timestamp,
+                'data_as_of': timestamp
             }
         }
         
@@ -1384,11 +1298,11 @@ class AWSMockServices:
             'format': export_format,
             'include_assessments': include_assessments,
             'status': 'completed',
-            'created_at': datetime.utcnow().isoformat(),
-            'completed_at': datetime.utcnow().isoformat(),
-            'export_data': export_data
+            'created_at': timestamp,
+            'completed_at': timestamp
         }
         
+        self._export_blobs.set(request_id, export_data, ex=self.EXPORT_BLOB_TTL)
         self.gdpr_data_requests_table.put_item(request_record)
         self.log_event('GDPR_Export', f'Data export requested by {user_email} - {request_id}')
         
@@ -1396,7 +1310,8 @@ class AWSMockServices:
     
     def request_data_deletion(self, user_email: str, deletion_type: str = 'complete') -> str:
         """Create data deletion request and return request ID"""
-        request_id = str(uuid.uuid4())
+        request_id = _uuid4().hex
+        now = _utcnow()
         
         # Store deletion request
         request_record = {
@@ -1405,8 +1320,8 @@ class AWSMockServices:
             'request_type': 'data_deletion',
             'deletion_type': deletion_type,
             'status': 'pending',
-            'created_at': datetime.utcnow().isoformat(),
-            'scheduled_for': (datetime.utcnow() + timedelta(days=30)).isoformat()
+            'created_at': now.isoformat(),
+            'scheduled_for': (now + timedelta(days=30)).isoformat()
         }
         
         self.gdpr_data_requests_table.put_item(request_record)
@@ -1418,10 +1333,24 @@ class AWSMockServices:
         """Get status of GDPR request"""
         return self.gdpr_data_requests_table.get_item(request_id)
     
+    def stream_export(self, request_id: str) -> Iterator[str]:
+        """Yield the JSON document of a data export request in chunks"""
+        export_data = self.get_export_data(request_id)
+        if export_data is None:
+            return
+        yield from _EXPORT_ENCODER.iterencode(export_data)
+    
+    def get_export_data(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Get the export document of a data export request, if it has not expired"""
+        return self._export_blobs.get(request_id)
+    
+    def iter_user_gdpr_requests(self, user_email: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield a user's GDPR requests, for existence checks and first-match lookups"""
+        return self.gdpr_data_requests_table.iter_gsi('user_email', user_email)
+    
     def get_user_gdpr_requests(self, user_email: str) -> List[Dict[str, Any]]:
         """Get all GDPR requests for a user"""
-        all_requests = self.gdpr_data_requests_table.scan()
-        return [req for req in all_requests if req.get('user_email') == user_email]
+        return self.gdpr_data_requests_table.query_gsi('user_email', user_email)
 
 # Global instance for use across the application
 aws_mock = AWSMockServices()
@@ -1435,6 +1364,10 @@ MOCK_ENV_VARS = {
     'CLOUDWATCH_LOG_GROUP': '/aws/lambda/ielts-genai-prep'
 }
 
+# Real environment layered over the mock values; a Lambda's environment is
+# fixed for the life of the container, so it is resolved once at import
+_RESOLVED_ENV = {**MOCK_ENV_VARS, **os.environ}
+
 def get_mock_env(key: str, default: Optional[str] = None) -> str:
     """Get environment variable with mock fallback"""
-    return os.environ.get(key, MOCK_ENV_VARS.get(key, default or ''))
\ No newline at end of file
+    return _RESOLVED_ENV.get(key, default or '')
\ No newline at end of file